@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the cost of getting a database connection from concurrent
+workers: a new connection per call, as get_db did, against the pool
+
+The MySQL server of PERSONAL_DATA_DB_* is used when
+PERSONAL_DATA_DB_NAME is set; otherwise a stand-in connection whose
+handshake and ping take HANDSHAKE_MS and PING_MS milliseconds
+
+    ./bench_db_pool.py [workers...]   (default: 1 4 16)
+"""
+
+import os
+import sys
+import threading
+import time
+from mysql.connector import connection
+from filtered_logger import ConnectionPool, DBCONFIG
+
+WORKERS: list = [int(arg) for arg in sys.argv[1:]] or [1, 4, 16]
+CALLS: int = 200
+HANDSHAKE_MS: float = 3
+PING_MS: float = 0.1
+
+
+class StandInConnection:
+    """Connection with the latency of a MySQL handshake and ping"""
+
+    in_transaction: bool = False
+
+    def __init__(self):
+        """Connects"""
+        time.sleep(HANDSHAKE_MS / 1000)
+
+    def is_connected(self) -> bool:
+        """Pings"""
+        time.sleep(PING_MS / 1000)
+        return True
+
+    def close(self) -> None:
+        """Disconnects"""
+
+
+def bench(name: str, get, workers: int) -> None:
+    """Gets and closes CALLS connections in each worker"""
+    latencies: list = []
+
+    def work():
+        for _ in range(CALLS):
+            start: float = time.perf_counter()
+            db = get()
+            latencies.append(time.perf_counter() - start)
+            db.close()
+    threads: list = [threading.Thread(target=work) for _ in range(workers)]
+    start: float = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed: float = time.perf_counter() - start
+    latencies.sort()
+    print(f"{name:>8} {workers:>3} workers: "
+          f"{len(latencies) / elapsed:8.0f} connections/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1e3:6.3f} ms, "
+          f"p99 {latencies[len(latencies) * 99 // 100] * 1e3:6.3f} ms")
+
+
+if __name__ == "__main__":
+    if os.getenv("PERSONAL_DATA_DB_NAME"):
+        def connect():
+            return connection.MySQLConnection(**DBCONFIG)
+    else:
+        print(f"stand-in connections: {HANDSHAKE_MS} ms handshake, "
+              f"{PING_MS} ms ping")
+        connect = StandInConnection
+    for workers in WORKERS:
+        bench("new", connect, workers)
+        pool = ConnectionPool(connect)
+        bench("pool", pool.acquire, workers)
+        pool.close()
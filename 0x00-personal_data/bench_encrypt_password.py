@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Benchmarks hash_passwords and verify_passwords throughput across
+bcrypt cost factors and numbers of worker processes
+
+    ./bench_encrypt_password.py [passwords [max workers]]
+    (default: 32 passwords, one worker per CPU)
+"""
+
+import os
+import sys
+import time
+from encrypt_password import hash_passwords, verify_passwords
+
+PASSWORDS: int = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+MAX_WORKERS: int = int(sys.argv[2]) if len(sys.argv) > 2 \
+    else os.cpu_count() or 1
+COSTS: tuple = (8, 10, 12)
+
+
+if __name__ == "__main__":
+    passwords: list = [f"password{i}" for i in range(PASSWORDS)]
+    for cost in COSTS:
+        workers: int = 1
+        while workers <= MAX_WORKERS:
+            start: float = time.perf_counter()
+            hashes: list = hash_passwords(passwords, workers, cost,
+                                          chunk_size=4)
+            hashing: float = time.perf_counter() - start
+            start = time.perf_counter()
+            valid: list = verify_passwords(list(zip(hashes, passwords)),
+                                           workers, chunk_size=4)
+            verifying: float = time.perf_counter() - start
+            assert all(valid)
+            print(f"cost {cost:>2}, {workers:>3} workers: "
+                  f"hash {PASSWORDS / hashing:8.1f}/s, "
+                  f"verify {PASSWORDS / verifying:8.1f}/s")
+            workers *= 2
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the export of the users table: the row by row logging of
+main() against the streaming export to each sink, on an SQLite copy
+of user_data.csv replicated to N rows
+
+    ./bench_export.py [N]   (default: 200000)
+"""
+
+import csv
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from filtered_logger import (export_rows, get_sink, LineSink, NDJSONSink,
+                             RedactingFormatter, PII_FIELDS)
+
+N: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+
+def fixture(path: str, count: int = N) -> sqlite3.Connection:
+    """Returns an SQLite database with `count` rows in its users table"""
+    with open("user_data.csv") as f:
+        reader = csv.reader(f)
+        columns: list = next(reader)
+        rows: list = list(reader)
+    db = sqlite3.connect(path)
+    db.execute(f"CREATE TABLE users ({', '.join(columns)})")
+    db.executemany(f"INSERT INTO users VALUES ({', '.join('?' * 8)})",
+                   (rows[i % len(rows)] for i in range(count)))
+    db.commit()
+    return db
+
+
+def log_rows(curs, stream) -> int:
+    """Logs the rows one at a time, as main() does"""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(RedactingFormatter(PII_FIELDS))
+    logger = logging.getLogger("bench_export")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    columns: list = [d[0] for d in curs.description]
+    count: int = 0
+    for row in curs.fetchall():
+        logger.info("".join(f"{key}={value};"
+                            for key, value in zip(columns, row)))
+        count += 1
+    return count
+
+
+def bench(db: sqlite3.Connection, name: str, export) -> None:
+    """Runs an export of the users table and prints its throughput"""
+    curs = db.cursor()
+    start: float = time.perf_counter()
+    curs.execute("SELECT * FROM users;")
+    count: int = export(curs)
+    elapsed: float = time.perf_counter() - start
+    print(f"{name:>16}: {count / elapsed:9.0f} rows/s")
+
+
+if __name__ == "__main__":
+    workdir: str = tempfile.mkdtemp()
+    db: sqlite3.Connection = fixture(os.path.join(workdir, "users.db"))
+    devnull = open(os.devnull, "w")
+    bench(db, "row by row", lambda curs: log_rows(curs, devnull))
+    bench(db, "stream lines", lambda curs: export_rows(
+        curs, LineSink(devnull)))
+    bench(db, "stream ndjson", lambda curs: export_rows(
+        curs, NDJSONSink(devnull)))
+    bench(db, "stream file", lambda curs: export_rows(
+        curs, get_sink("file", os.path.join(workdir, "users.log"))))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmarks filter_datum against the former per-field implementation
+on log lines built from user_data.csv, after checking its output on
+values containing regex metacharacters
+"""
+
+import csv
+import re
+import timeit
+from typing import List
+from filtered_logger import filter_datum, PII_FIELDS, RedactingFormatter
+
+SEPARATOR: str = RedactingFormatter.SEPARATOR
+REDACTION: str = RedactingFormatter.REDACTION
+PREFIX: str = "[HOLBERTON] user_data INFO 2019-11-19 18:37:59,596: "
+CHECKS: list = [
+    (["password"], "password=a(b;name=x;", "password=***;name=x;"),
+    (["password"], "password=.*;name=.*;", "password=***;name=.*;"),
+    (["password"], "password=a|b;ip=a;", "password=***;ip=a;"),
+    (["ssn"], "ssn=1\\2;ip=1\\2;", "ssn=***;ip=1\\2;"),
+    (["a.b"], "a.b=1;axb=2;", "a.b=***;axb=2;"),
+    (["name"], "username=u;name=n;", "username=u;name=***;"),
+    (["email", "password"], "email=e;password=p", "email=***;password=p"),
+]
+
+
+def legacy_filter_datum(fields: List[str], redaction: str,
+                        message: str, separator: str) -> str:
+    """filter_datum before the single pass engine"""
+    for field in fields:
+        sub = re.search(f"(?<={field}=).*?(?={separator})", message)
+        message = re.sub(sub.group(0), redaction, message) if sub else message
+    return message
+
+
+def log_lines() -> List[str]:
+    """Returns one formatted log line per row of user_data.csv"""
+    with open("user_data.csv") as f:
+        return [PREFIX + "".join(f"{key}={value}{SEPARATOR}"
+                                 for key, value in row.items())
+                for row in csv.DictReader(f)]
+
+
+if __name__ == "__main__":
+    for fields, message, expected in CHECKS:
+        redacted: str = filter_datum(fields, REDACTION, message, SEPARATOR)
+        assert redacted == expected, (fields, message, redacted)
+    print(f"{len(CHECKS)} checks passed")
+
+    lines: List[str] = log_lines() * 1000
+    for name, fn in (("legacy", legacy_filter_datum),
+                     ("single pass", filter_datum)):
+        errors: list = []
+
+        def run():
+            for line in lines:
+                try:
+                    fn(PII_FIELDS, REDACTION, line, SEPARATOR)
+                except re.error:
+                    errors.append(line)
+        elapsed: float = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{name:>12}: {elapsed / len(lines) * 1e6:6.2f} us/line, "
+              f"{len(errors) // 3} lines failing with re.error")
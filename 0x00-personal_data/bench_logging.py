@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the time (and the CPU time of the calling thread, which
+is what remains on a single core) spent by the caller per log record,
+with the synchronous handler, with the queue handler (drop and block
+policies) and with structured records, writing to /dev/null
+"""
+
+import csv
+import logging
+import os
+import queue
+import time
+from filtered_logger import (BatchingQueueListener, BoundedQueueHandler,
+                             RedactingFormatter, PII_FIELDS)
+
+RECORDS: int = 100000
+QUEUE_SIZE: int = 10000
+
+
+def rows() -> list:
+    """Returns the rows of user_data.csv"""
+    with open("user_data.csv") as f:
+        return list(csv.DictReader(f))
+
+
+def bench(name: str, policy: str = None, structured: bool = False) -> None:
+    """Logs RECORDS records and prints the time spent by the caller"""
+    stream = open(os.devnull, "w")
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(RedactingFormatter(PII_FIELDS))
+    logger = logging.getLogger(f"bench_{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = None
+    if policy is None:
+        logger.addHandler(handler)
+    else:
+        records: queue.Queue = queue.Queue(QUEUE_SIZE)
+        listener = BatchingQueueListener(records, handler)
+        listener.start()
+        queue_handler = BoundedQueueHandler(records, policy)
+        logger.addHandler(queue_handler)
+    fields: list = rows()
+    lines: list = ["".join(f"{key}={value};" for key, value in row.items())
+                   for row in fields]
+    start: float = time.perf_counter()
+    cpu: float = time.thread_time()
+    for i in range(RECORDS):
+        if structured:
+            logger.info("", extra={"fields": fields[i % len(fields)]})
+        else:
+            logger.info(lines[i % len(lines)])
+    cpu = time.thread_time() - cpu
+    caller: float = time.perf_counter() - start
+    if listener is not None:
+        listener.stop()
+    total: float = time.perf_counter() - start
+    stats: str = ""
+    if listener is not None:
+        stats = (f", {listener.written} written in {listener.batches} "
+                 f"batches, {queue_handler.dropped} dropped")
+    print(f"{name:>6}: caller {caller / RECORDS * 1e6:5.2f} us/record "
+          f"({cpu / RECORDS * 1e6:5.2f} us cpu), total {total:.2f}s{stats}")
+    stream.close()
+
+
+if __name__ == "__main__":
+    bench("sync")
+    bench("drop", "drop")
+    bench("block", "block")
+    bench("fields", structured=True)
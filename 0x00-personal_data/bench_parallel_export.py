@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the partitioned export of the users table (partitioned on
+email) across 1 to N worker processes, on the SQLite fixture of
+bench_export.py, and checks that its output matches the sequential
+export ordered by email
+
+    ./bench_parallel_export.py [rows [max workers]]
+    (default: 200000 rows, one worker per CPU)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from bench_export import fixture
+from filtered_logger import export_partitioned, export_rows, LineSink
+
+ROWS: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+MAX_WORKERS: int = int(sys.argv[2]) if len(sys.argv) > 2 \
+    else os.cpu_count() or 1
+DB_PATH: str = os.path.join(tempfile.mkdtemp(), "users.db")
+
+
+def connect() -> sqlite3.Connection:
+    """Connects to the fixture"""
+    return sqlite3.connect(DB_PATH)
+
+
+if __name__ == "__main__":
+    db: sqlite3.Connection = fixture(DB_PATH, ROWS)
+    db.execute("CREATE INDEX users_email ON users (email)")
+    db.execute("UPDATE users SET email = NULL WHERE rowid % 1000 = 0")
+    db.commit()
+    expected_path: str = DB_PATH + ".expected"
+    with open(expected_path, "w") as f:
+        curs = db.execute("SELECT * FROM users ORDER BY email")
+        export_rows(curs, LineSink(f))
+    with open(expected_path) as f:
+        expected: list = [line.split(": ", 1)[1] for line in f]
+    workers: int = 1
+    while workers <= MAX_WORKERS:
+        out_path: str = DB_PATH + ".out"
+        with open(out_path, "w") as f:
+            start: float = time.perf_counter()
+            count: int = export_partitioned(LineSink(f), workers, connect,
+                                            placeholder="?")
+            elapsed: float = time.perf_counter() - start
+        with open(out_path) as f:
+            assert [line.split(": ", 1)[1] for line in f] == expected
+        print(f"{workers:>3} workers: {count / elapsed:9.0f} rows/s")
+        workers *= 2
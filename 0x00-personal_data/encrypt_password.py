@@ -2,11 +2,18 @@
 """Encrypting passwords"""
 
 import bcrypt
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from typing import Callable, List, Tuple
+
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+# passwords handed to a worker process at a time by the batch functions
+BATCH_CHUNK_SIZE: int = int(os.getenv("BCRYPT_BATCH_CHUNK_SIZE", 16))
 
 
 def hash_password(password: str) -> bytes:
     """Returns a salted and hashed password byte string"""
-    salt: bytes = bcrypt.gensalt()
+    salt: bytes = bcrypt.gensalt(BCRYPT_ROUNDS)
     hashed: bytes = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed
 
@@ -14,3 +21,98 @@ def hash_password(password: str) -> bytes:
 def is_valid(hashed_password: bytes, password: str) -> bool:
     """Validates that the encrypted password matches provided password"""
     return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
+
+
+def _hash_chunk(passwords: List[str], rounds: int) -> List[bytes]:
+    """Hashes passwords, None for those that cannot be hashed"""
+    hashes: List[bytes] = []
+    for password in passwords:
+        try:
+            hashes.append(bcrypt.hashpw(password.encode("utf-8"),
+                                        bcrypt.gensalt(rounds)))
+        except (AttributeError, TypeError, ValueError):
+            hashes.append(None)
+    return hashes
+
+
+def _verify_chunk(pairs: List[Tuple[bytes, str]]) -> List[bool]:
+    """Validates (hashed password, password) pairs, False for the pairs
+    that cannot be checked"""
+    results: List[bool] = []
+    for hashed_password, password in pairs:
+        try:
+            results.append(is_valid(hashed_password, password))
+        except (AttributeError, TypeError, ValueError):
+            results.append(False)
+    return results
+
+
+def _run_chunks(fn: Callable, items: list, args: tuple, workers: int,
+                chunk_size: int, progress: Callable[[int, int], None]
+                ) -> list:
+    """
+    Applies fn to the chunks of items in a pool of `workers` processes
+    (in the caller if workers <= 1), calling progress(done, total) as
+    chunks complete, and returns the results in the order of items
+    """
+    chunks: List[list] = [items[i:i + chunk_size]
+                          for i in range(0, len(items), chunk_size)]
+    results: List[list] = [None] * len(chunks)
+    done: int = 0
+    if workers is not None and workers <= 1:
+        for i, chunk in enumerate(chunks):
+            results[i] = fn(chunk, *args)
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(items))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures: dict = {pool.submit(fn, chunk, *args): i
+                             for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i: int = futures[future]
+                results[i] = future.result()
+                done += len(chunks[i])
+                if progress is not None:
+                    progress(done, len(items))
+    return [result for chunk in results for result in chunk]
+
+
+def hash_passwords(passwords: List[str], workers: int = None,
+                   rounds: int = BCRYPT_ROUNDS,
+                   chunk_size: int = BATCH_CHUNK_SIZE,
+                   progress: Callable[[int, int], None] = None
+                   ) -> List[bytes]:
+    """
+    Args:
+        passwords (list): the passwords to hash
+        workers (int): processes hashing them (default: one per CPU)
+        rounds (int): the bcrypt cost factor
+        chunk_size (int): passwords sent to a process at a time
+        progress (callable): called with (passwords done, total)
+            each time a chunk is done
+    Returns:
+        (list): the hash of each password, None for a password that
+            cannot be hashed (not a string, or over 72 bytes)
+    """
+    return _run_chunks(_hash_chunk, list(passwords), (rounds,), workers,
+                       chunk_size, progress)
+
+
+def verify_passwords(pairs: List[Tuple[bytes, str]], workers: int = None,
+                     chunk_size: int = BATCH_CHUNK_SIZE,
+                     progress: Callable[[int, int], None] = None
+                     ) -> List[bool]:
+    """
+    Args:
+        pairs (list): (hashed password, password) pairs to validate
+        workers (int): processes validating them (default: one per CPU)
+        chunk_size (int): pairs sent to a process at a time
+        progress (callable): called with (pairs done, total)
+            each time a chunk is done
+    Returns:
+        (list): whether each password matches its hash, False for a
+            pair that cannot be checked
+    """
+    return _run_chunks(_verify_chunk, list(pairs), (), workers,
+                       chunk_size, progress)
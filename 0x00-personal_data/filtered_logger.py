@@ -1,11 +1,57 @@
 #!/usr/bin/env python3
 """Use a regex to replace occurrences of certain field values."""
 
+import atexit
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import json
 import logging
+from logging.handlers import QueueHandler, RotatingFileHandler
 from mysql.connector import connection, Error
+from mysql.connector.errors import PoolError
 import os
+import queue
 import re
-from typing import List
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+# records queued for the background writer, 0 to log on the caller thread
+LOG_QUEUE_SIZE: int = int(os.getenv("PERSONAL_DATA_LOG_QUEUE_SIZE", 0))
+# what to do with a record when the queue is full: "drop" or "block"
+LOG_QUEUE_POLICY: str = os.getenv("PERSONAL_DATA_LOG_QUEUE_POLICY", "drop")
+LOG_BATCH_SIZE: int = int(os.getenv("PERSONAL_DATA_LOG_BATCH_SIZE", 256))
+# output of main(): "log" (the logger), "stdout", "file" or "ndjson"
+EXPORT_SINK: str = os.getenv("PERSONAL_DATA_EXPORT_SINK", "log")
+EXPORT_PATH: str = os.getenv("PERSONAL_DATA_EXPORT_PATH")
+EXPORT_BATCH_SIZE: int = int(os.getenv("PERSONAL_DATA_EXPORT_BATCH_SIZE",
+                                       1000))
+EXPORT_MAX_BYTES: int = int(os.getenv("PERSONAL_DATA_EXPORT_MAX_BYTES",
+                                      100 * 1024 * 1024))
+EXPORT_BACKUPS: int = int(os.getenv("PERSONAL_DATA_EXPORT_BACKUPS", 5))
+# processes of the export, each redacting one range of the export key
+EXPORT_WORKERS: int = int(os.getenv("PERSONAL_DATA_EXPORT_WORKERS", 1))
+EXPORT_KEY: str = os.getenv("PERSONAL_DATA_EXPORT_KEY", "email")
+
+
+@lru_cache(maxsize=128)
+def redaction_pattern(fields: Tuple[str, ...],
+                      separator: str) -> re.Pattern:
+    """
+    Returns the compiled pattern matching the values of all fields,
+    `field=value` up to the next separator, as one alternation
+    (starting with the field names, so the regex engine can skip
+    ahead to their first characters)
+    """
+    names: str = "|".join(re.escape(field) for field in fields)
+    if len(separator) == 1:
+        value: str = f"[^{re.escape(separator)}]*(?={re.escape(separator)})"
+    else:
+        value = f".*?(?={re.escape(separator)})"
+    return re.compile(f"({names})={value}")
 
 
 def filter_datum(fields: List[str], redaction: str,
@@ -21,15 +67,24 @@ def filter_datum(fields: List[str], redaction: str,
     Returns:
         (str): the log message obfuscated
     """
-    for field in fields:
-        sub: str = re.search(f"(?<={field}=).*?(?={separator})", message)
-        message = re.sub(sub.group(0), redaction, message) if sub else message
-    return message
+    if not fields:
+        return message
+    pattern: re.Pattern = redaction_pattern(tuple(fields), separator)
+
+    def redact(match: re.Match) -> str:
+        """Redacts a value unless its field name is the end of another"""
+        start: int = match.start()
+        if start and (message[start - 1].isalnum() or
+                      message[start - 1] == "_"):
+            return match.group(0)
+        return f"{match.group(1)}={redaction}"
+    return pattern.sub(redact, message)
 
 
 def get_logger() -> logging.Logger:
     """
-    Returns a logger object
+    Returns a logger object; with PERSONAL_DATA_LOG_QUEUE_SIZE set,
+    records are queued and redacted and written by a background thread
     """
     logging.basicConfig(level=logging.INFO, encoding="utf-8")
     handler = logging.StreamHandler()
@@ -37,13 +92,139 @@ def get_logger() -> logging.Logger:
     formatter = RedactingFormatter(PII_FIELDS)
     handler.setFormatter(formatter)
     logger = logging.getLogger("user_data")
-    logger.addHandler(handler)
+    if LOG_QUEUE_SIZE > 0:
+        records: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        listener = BatchingQueueListener(records, handler, LOG_BATCH_SIZE)
+        listener.start()
+        atexit.register(listener.stop)
+        queue_handler = BoundedQueueHandler(records, LOG_QUEUE_POLICY)
+        queue_handler.listener = listener
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(handler)
     logger.propagate = False
     return logger
 
 
+class BoundedQueueHandler(QueueHandler):
+    """ Handler queueing records without formatting them
+
+    When the queue is full, records are counted in `dropped` and
+    discarded with the "drop" policy, or the caller waits for room
+    with the "block" policy.
+    """
+
+    def __init__(self, records: queue.Queue, policy: str = "drop"):
+        """Initializes the queue and the overflow policy"""
+        super().__init__(records)
+        if policy not in ("drop", "block"):
+            raise ValueError(f"unknown queue policy: {policy}")
+        self.policy: str = policy
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Returns a copy of the record with its message merged, so it
+        can be formatted later on another thread"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queues a record according to the policy"""
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """ Thread formatting the queued records with a handler, and writing
+    all the records waiting in the queue (up to `batch_size`) at once
+    """
+
+    _STOP = None
+
+    def __init__(self, records: queue.Queue, handler: logging.Handler,
+                 batch_size: int = LOG_BATCH_SIZE):
+        """Initializes the listener of a queue"""
+        self.queue: queue.Queue = records
+        self.handler: logging.Handler = handler
+        self.batch_size: int = batch_size
+        self.written: int = 0
+        self.batches: int = 0
+        self._thread: threading.Thread = None
+
+    def start(self) -> None:
+        """Starts the background thread"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Writes the records queued and stops the background thread"""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Writes the queued records batch by batch until stopped"""
+        while True:
+            batch: list = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopped: bool = self._STOP in batch
+            if stopped:
+                batch = batch[:batch.index(self._STOP)]
+            try:
+                self.write(batch)
+            except Exception:
+                # reported like Handler.emit does, once for the batch, and
+                # the thread goes on with the next one
+                if batch:
+                    self.handler.handleError(batch[0])
+            if stopped:
+                return
+
+    def write(self, batch: List[logging.LogRecord]) -> None:
+        """Formats and writes records, in one write for a stream handler"""
+        handler: logging.Handler = self.handler
+        batch = [record for record in batch
+                 if record.levelno >= handler.level and
+                 handler.filter(record)]
+        if not batch:
+            return
+        if isinstance(handler, logging.StreamHandler):
+            text: str = "".join(handler.format(record) + handler.terminator
+                                for record in batch)
+            with handler.lock:
+                handler.stream.write(text)
+                handler.flush()
+        else:
+            for record in batch:
+                handler.handle(record)
+        self.written += len(batch)
+        self.batches += 1
+
+
 class RedactingFormatter(logging.Formatter):
     """ Redacting Formatter class
+
+    A record logged with `extra={"fields": {...}}` is structured: its
+    message is rendered from the field dict, with the values of the
+    fields to redact replaced by a set lookup on their key. The message
+    of other records is redacted by filter_datum.
     """
 
     REDACTION = "***"
@@ -54,15 +235,30 @@ class RedactingFormatter(logging.Formatter):
         """Initializes format parameters"""
         super(RedactingFormatter, self).__init__(fmt=self.FORMAT)
         self.fields: list = fields
+        self.field_set: frozenset = frozenset(fields)
+
+    def render(self, fields: Iterable[Tuple[str, object]]) -> str:
+        """Returns the `key=value;` message of (key, value) pairs, with
+        the values of the fields to redact replaced"""
+        return "".join(
+            f"{key}={self.REDACTION if key in self.field_set else value}"
+            f"{self.SEPARATOR}" for key, value in fields)
 
     def format(self, record: logging.LogRecord) -> str:
         """Returns formatted record message with format settings"""
+        fields: dict = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            record = copy.copy(record)
+            record.msg = self.render(fields.items())
+            record.args = None
+            return super().format(record)
         msg: str = super().format(record)
         return filter_datum(self.fields, self.REDACTION,
                             msg, self.SEPARATOR)
 
 
 PII_FIELDS: tuple = ("email", "name", "phone", "password", "ssn")
+PII_FIELD_SET: frozenset = frozenset(PII_FIELDS)
 
 DBCONFIG = {
     "user": os.getenv("PERSONAL_DATA_DB_USERNAME", "root"),
@@ -73,22 +269,402 @@ DBCONFIG = {
 }
 
 
-def get_db() -> connection.MySQLConnection:
-    """Returns connector to the database"""
-    try:
-        connector = connection.MySQLConnection(**DBCONFIG)
-    except Error:
-        raise
-    return connector
+# connections kept by the pool, and seconds to wait for a free one
+DB_POOL_SIZE: int = int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT: float = float(os.getenv("PERSONAL_DATA_DB_POOL_TIMEOUT", 30))
+# seconds a connection can stay idle before it is pinged on reuse
+DB_POOL_CHECK_AFTER: float = float(
+    os.getenv("PERSONAL_DATA_DB_POOL_CHECK_AFTER", 5))
+# connection attempts after the first failure, and the first backoff delay
+DB_RETRIES: int = int(os.getenv("PERSONAL_DATA_DB_RETRIES", 5))
+DB_BACKOFF: float = float(os.getenv("PERSONAL_DATA_DB_BACKOFF", 0.1))
+DB_BACKOFF_MAX: float = 5
+
+
+class PooledConnection:
+    """ Connection borrowed from a ConnectionPool, with every attribute of
+    the underlying connection; close() gives it back to the pool
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn):
+        """Wraps a connection of a pool"""
+        self._pool: ConnectionPool = pool
+        self._conn = conn
+
+    def __getattr__(self, name: str):
+        """Returns the attributes of the underlying connection"""
+        if self._conn is None:
+            raise PoolError("connection returned to the pool")
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        """Returns the connection to the pool"""
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+    def __enter__(self) -> "PooledConnection":
+        """Returns the connection"""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Returns the connection to the pool"""
+        self.close()
+
+
+class ConnectionPool:
+    """ Bounded pool of database connections
+
+    At most `size` connections are open; acquire() waits up to `timeout`
+    seconds for one to be released, then raises PoolError. Idle
+    connections are reused last in first out, and pinged first when they
+    have been idle for over `check_after` seconds: a dead one is replaced.
+    Failed connection attempts are retried `retries` times with an
+    exponential backoff starting at `backoff` seconds.
+    """
+
+    def __init__(self, connect: Callable = None, size: int = DB_POOL_SIZE,
+                 timeout: float = DB_POOL_TIMEOUT,
+                 check_after: float = DB_POOL_CHECK_AFTER,
+                 retries: int = DB_RETRIES, backoff: float = DB_BACKOFF):
+        """Initializes an empty pool"""
+        self.connect: Callable = connect or (
+            lambda: connection.MySQLConnection(**DBCONFIG))
+        self.size: int = size
+        self.timeout: float = timeout
+        self.check_after: float = check_after
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.created: int = 0
+        self.reused: int = 0
+        self.replaced: int = 0
+        self._idle: List[Tuple[object, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self):
+        """Opens a connection, retrying with backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                conn = self.connect()
+                self.created += 1
+                return conn
+            except (Error, OSError):
+                if attempt == self.retries:
+                    raise
+                time.sleep(min(self.backoff * 2 ** attempt, DB_BACKOFF_MAX))
+
+    @staticmethod
+    def _discard(conn) -> None:
+        """Closes a connection, ignoring errors"""
+        try:
+            conn.close()
+        except (Error, OSError):
+            pass
+
+    def acquire(self) -> PooledConnection:
+        """Returns a connection, to be closed to give it back"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(f"no connection available in {self.timeout}s")
+        try:
+            conn = None
+            with self._lock:
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+            if conn is not None and \
+                    time.monotonic() - idle_since > self.check_after:
+                try:
+                    healthy: bool = conn.is_connected()
+                except (Error, OSError):
+                    healthy = False
+                if not healthy:
+                    self._discard(conn)
+                    conn = None
+                    self.replaced += 1
+            if conn is None:
+                conn = self._open()
+            else:
+                self.reused += 1
+            return PooledConnection(self, conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn) -> None:
+        """Puts a connection back in the pool, rolling back its open
+        transaction, or discards it if that fails"""
+        try:
+            if getattr(conn, "in_transaction", False):
+                conn.rollback()
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        except (Error, OSError):
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Closes the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_DB_POOL: ConnectionPool = None
+_DB_POOL_LOCK = threading.Lock()
+
+
+def get_db_pool() -> ConnectionPool:
+    """Returns the connection pool shared by get_db, created on first use"""
+    global _DB_POOL
+    with _DB_POOL_LOCK:
+        if _DB_POOL is None:
+            _DB_POOL = ConnectionPool()
+        return _DB_POOL
+
+
+def get_db() -> PooledConnection:
+    """Returns connector to the database, from the shared pool: closing
+    it gives it back"""
+    return get_db_pool().acquire()
+
+
+def fetch_batches(curs, batch_size: int = EXPORT_BATCH_SIZE
+                  ) -> Iterator[List[tuple]]:
+    """Yields the rows of an executed cursor by batches of fetchmany"""
+    while True:
+        rows: List[tuple] = curs.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+class LineSink:
+    """ Writes rows as redacted log lines, a batch at a time
+    """
+
+    def __init__(self, stream=None):
+        """Initializes the output stream (stdout by default)"""
+        self.stream = stream if stream is not None else sys.stdout
+        self.formatter = RedactingFormatter(PII_FIELDS)
+
+    def render(self, columns: Tuple[str, ...], rows: List[tuple]) -> str:
+        """Returns the redacted log lines of rows, sharing one prefix"""
+        prefix: str = logging.Formatter.format(
+            self.formatter, logging.LogRecord(
+                "user_data", logging.INFO, __file__, 0, "", None, None))
+        return "".join(prefix + self.formatter.render(zip(columns, row)) +
+                       "\n" for row in rows)
+
+    def write(self, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+        """Writes a batch of rows"""
+        self.write_text(self.render(columns, rows))
+
+    def write_text(self, text: str) -> None:
+        """Writes rendered rows"""
+        self.stream.write(text)
+
+    def close(self) -> None:
+        """Flushes the output"""
+        self.stream.flush()
+
+
+class RotatingFileSink(LineSink):
+    """ Writes redacted log lines to a file rotated past `max_bytes`,
+    keeping `backups` old files (a batch is never split)
+    """
+
+    def __init__(self, path: str, max_bytes: int = EXPORT_MAX_BYTES,
+                 backups: int = EXPORT_BACKUPS):
+        """Opens the file"""
+        super().__init__()
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                           backupCount=backups,
+                                           encoding="utf-8")
+        self.handler.terminator = ""
+
+    def write_text(self, text: str) -> None:
+        """Writes rendered rows"""
+        self.handler.handle(logging.makeLogRecord({"msg": text}))
+
+    def close(self) -> None:
+        """Closes the file"""
+        self.handler.close()
+
+
+class NDJSONSink(LineSink):
+    """ Writes rows as JSON objects, one per line, with the PII fields
+    redacted
+    """
+
+    def render(self, columns: Tuple[str, ...], rows: List[tuple]) -> str:
+        """Returns the redacted JSON lines of rows"""
+        pii: List[bool] = [column in PII_FIELD_SET for column in columns]
+        redaction: str = RedactingFormatter.REDACTION
+        return "".join(json.dumps(
+            {key: redaction if redact else value
+             for key, redact, value in zip(columns, pii, row)},
+            default=str) + "\n" for row in rows)
+
+    def close(self) -> None:
+        """Flushes the output"""
+        self.stream.flush()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+def get_sink(kind: str = EXPORT_SINK, path: str = EXPORT_PATH):
+    """Returns the export sink configured by PERSONAL_DATA_EXPORT_*"""
+    if kind == "stdout":
+        return LineSink()
+    if kind == "file":
+        return RotatingFileSink(path or "user_data.log")
+    if kind == "ndjson":
+        return NDJSONSink(open(path, "w", encoding="utf-8")
+                          if path else None)
+    raise ValueError(f"unknown export sink: {kind}")
+
+
+def export_rows(curs, sink, batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Streams the rows of an executed cursor to a sink by batches, without
+    holding more than one batch in memory, and returns their number
+    """
+    columns: Tuple[str, ...] = tuple(d[0] for d in curs.description)
+    count: int = 0
+    for rows in fetch_batches(curs, batch_size):
+        sink.write(columns, rows)
+        count += len(rows)
+    sink.close()
+    return count
+
+
+def partition_keys(db, key: str, partitions: int) -> List[object]:
+    """
+    Returns the sorted distinct values of the key column splitting the
+    users table into `partitions` ranges of about the same number of rows
+    """
+    curs = db.cursor()
+    curs.execute(f"SELECT COUNT(*) FROM users WHERE {key} IS NOT NULL;")
+    count: int = curs.fetchone()[0]
+    bounds: list = []
+    for i in range(1, partitions):
+        offset: int = count * i // partitions
+        curs.execute(f"SELECT {key} FROM users WHERE {key} IS NOT NULL "
+                     f"ORDER BY {key} LIMIT 1 OFFSET {offset};")
+        row: tuple = curs.fetchone()
+        if row is not None and (not bounds or row[0] > bounds[-1]):
+            bounds.append(row[0])
+    curs.close()
+    return bounds
+
+
+_INHERITED_DB_POOLS: List[ConnectionPool] = []
+
+
+def _reset_db_pool() -> None:
+    """Sets aside the connection pool inherited by a worker process: its
+    connections belong to the parent, and stay referenced so that garbage
+    collection does not close them under it"""
+    global _DB_POOL
+    if _DB_POOL is not None:
+        _INHERITED_DB_POOLS.append(_DB_POOL)
+    _DB_POOL = None
+
+
+def export_partition(connect: Callable, key: str, low, high, path: str,
+                     ndjson: bool, placeholder: str = "%s",
+                     batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Writes the rendered rows whose key is in [low, high) to a file, the
+    first range (low None) including the rows without key and the last
+    one (high None) being unbounded, and returns their number
+    """
+    conditions: list = []
+    params: list = []
+    if low is not None:
+        conditions.append(f"{key} >= {placeholder}")
+        params.append(low)
+    if high is not None:
+        conditions.append(f"{key} < {placeholder}")
+        params.append(high)
+        if low is None:
+            conditions[-1] = f"({key} IS NULL OR {conditions[-1]})"
+    where: str = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    db = connect()
+    curs = db.cursor()
+    curs.execute(f"SELECT * FROM users{where} ORDER BY {key};", params)
+    with open(path, "w", encoding="utf-8") as f:
+        count: int = export_rows(curs, NDJSONSink(f) if ndjson
+                                 else LineSink(f), batch_size)
+    curs.close()
+    db.close()
+    return count
+
+
+def export_partitioned(sink, workers: int = EXPORT_WORKERS,
+                       connect: Callable = get_db, key: str = EXPORT_KEY,
+                       placeholder: str = "%s",
+                       batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Exports the users table in `workers` processes, each rendering one
+    range of the key column to a temporary file, and copies the files
+    to the sink in key order as they complete. Returns the row count.
+    `connect` must be importable by the workers, and `placeholder` is
+    the parameter marker of the database driver
+    """
+    if not re.fullmatch(r"\w+", key):
+        raise ValueError(f"invalid export key: {key}")
+    db = connect()
+    bounds: list = partition_keys(db, key, workers)
+    db.close()
+    if _DB_POOL is not None:
+        # not to share the sockets of idle connections with the workers
+        _DB_POOL.close()
+    ranges: list = list(zip([None] + bounds, bounds + [None]))
+    ndjson: bool = isinstance(sink, NDJSONSink)
+    count: int = 0
+    with tempfile.TemporaryDirectory() as workdir, \
+            ProcessPoolExecutor(workers, initializer=_reset_db_pool) as pool:
+        paths: List[str] = [os.path.join(workdir, f"{i}.part")
+                            for i in range(len(ranges))]
+        futures: list = [pool.submit(export_partition, connect, key, low,
+                                     high, path, ndjson, placeholder,
+                                     batch_size)
+                         for (low, high), path in zip(ranges, paths)]
+        for future, path in zip(futures, paths):
+            count += future.result()
+            with open(path, encoding="utf-8") as f:
+                while True:
+                    lines: List[str] = f.readlines(1 << 20)
+                    if not lines:
+                        break
+                    sink.write_text("".join(lines))
+            os.remove(path)
+    sink.close()
+    return count
 
 
 def main() -> None:
     """
     Retrieves all rows in the users table
-    and displays each row under a filtered format
+    and displays each row under a filtered format, or streams them to
+    the PERSONAL_DATA_EXPORT_SINK sink
     """
+    if EXPORT_SINK != "log" and EXPORT_WORKERS > 1:
+        export_partitioned(get_sink())
+        return
+    if EXPORT_SINK != "log":
+        db: PooledConnection = get_db()
+        curs = db.cursor(buffered=False)
+        curs.execute("SELECT * FROM users;")
+        export_rows(curs, get_sink())
+        curs.close()
+        db.close()
+        return
     logger: logging.Logger = get_logger()
-    db: connection.MySQLConnection = get_db()
+    db: PooledConnection = get_db()
     curs = db.cursor()
     curs.execute("SELECT * FROM users;")
     for name, email, phone, ssn, password, ip, last_login, user_agent in curs:
@@ -102,7 +678,8 @@ def main() -> None:
             "last_login": last_login,
             "user_agent": user_agent
         }
-        logger.log(logger.getEffectiveLevel(), **mapping)
+        logger.log(logger.getEffectiveLevel(), "",
+                   extra={"fields": mapping})
     curs.close()
     db.close()
 
@@ -2,13 +2,17 @@
 """
 Route module for the API
 """
-from api.v1.auth.auth import Auth
+from api.v1.auth.auth import Auth, MISSING_CREDENTIALS, AuthResult
 from api.v1.auth.basic_auth import BasicAuth
+from api.v1.auth.path_matcher import PathMatcher
 from api.v1.auth.session_auth import SessionAuth
 from api.v1.auth.session_exp_auth import SessionExpAuth
+from api.v1.auth.session_db_auth import SessionDBAuth
+from api.v1.auth.session_redis_auth import SessionRedisAuth
+from api.v1.auth.session_signed_auth import SessionSignedAuth
 from os import getenv
 from api.v1.views import app_views
-from flask import Flask, jsonify, abort, request
+from flask import Flask, jsonify, abort, request, g
 from flask_cors import (CORS, cross_origin)
 import os
 
@@ -25,6 +29,12 @@ if os.getenv("AUTH_TYPE", None):
         auth = SessionAuth()
     elif os.getenv("AUTH_TYPE") == "session_exp_auth":
         auth = SessionExpAuth()
+    elif os.getenv("AUTH_TYPE") == "session_db_auth":
+        auth = SessionDBAuth()
+    elif os.getenv("AUTH_TYPE") == "session_redis_auth":
+        auth = SessionRedisAuth()
+    elif os.getenv("AUTH_TYPE") == "signed_session_auth":
+        auth = SessionSignedAuth()
     else:
         auth = Auth()
 
@@ -34,22 +44,35 @@ TRUSTED_PATHS = [
     '/api/v1/forbidden/',
     '/api/v1/auth_session/login/'
 ]
+TRUSTED_PATHS_MATCHER = PathMatcher(TRUSTED_PATHS)
+# the timings tell apart the failures of known and unknown users: only
+# send them when debugging
+AUTH_SERVER_TIMING = os.getenv("AUTH_SERVER_TIMING", "0") != "0"
 
 
 @app.before_request
 def preliminaries() -> None:
     """Checks if authentication is required and meets the requirements"""
+    request.current_user = None
     if auth is not None:
-        if auth.require_auth(request.path, TRUSTED_PATHS):
-            if os.getenv("AUTH_TYPE") == "session_auth" and \
-                    not auth.session_cookie(request):
-                abort(401)
-            elif os.getenv("AUTH_TYPE") != "session_auth" and \
-                    not auth.authorization_header(request):
-                abort(401)
-            if not auth.current_user(request):
-                abort(403)
-            request.current_user = auth.current_user(request)
+        result: AuthResult = auth.resolve(request, TRUSTED_PATHS_MATCHER)
+        g.auth_timings = result.timings
+        if result.reason == MISSING_CREDENTIALS:
+            abort(401)
+        if result.reason is not None:
+            abort(403)
+        request.current_user = result.user
+
+
+@app.after_request
+def server_timing(response):
+    """Reports the time spent in each authentication stage"""
+    timings: dict = g.get("auth_timings")
+    if AUTH_SERVER_TIMING and timings:
+        response.headers.add("Server-Timing", ", ".join(
+            "auth_{};dur={:.3f}".format(stage, seconds * 1000)
+            for stage, seconds in timings.items()))
+    return response
 
 
 @app.errorhandler(401)
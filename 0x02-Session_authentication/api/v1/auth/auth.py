@@ -3,23 +3,42 @@
 Module for authentication handling
 """
 
+from api.v1.auth.path_matcher import PathMatcher
 from flask import request
-from typing import List, TypeVar
+from typing import List, NamedTuple, TypeVar
 import os
+import time
 
 SESSION_NAME = os.getenv("SESSION_NAME")
+MISSING_CREDENTIALS = "missing credentials"
+INVALID_CREDENTIALS = "invalid credentials"
+
+
+class AuthResult(NamedTuple):
+    """Outcome of authenticating a request
+
+    `reason` is None when the request is authenticated (or does not need
+    to be), MISSING_CREDENTIALS or INVALID_CREDENTIALS otherwise.
+    `timings` holds the seconds spent in each stage, in order.
+    """
+    user: TypeVar('User') = None
+    reason: str = None
+    timings: dict = {}
 
 
 class Auth:
     """Authentication system"""
 
     def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
-        """Checks if authentication is required for path"""
+        """Checks if authentication is required for path
+
+        `excluded_paths` is a list of patterns or, to avoid compiling them
+        on each call, a PathMatcher"""
         if path is None or not excluded_paths:
             return True
-        if path in excluded_paths or f"{path}/" in excluded_paths:
-            return False
-        return True
+        if not isinstance(excluded_paths, PathMatcher):
+            excluded_paths = PathMatcher(excluded_paths)
+        return not excluded_paths.match(path)
 
     def authorization_header(self, request=None) -> str:
         """Returns authorization header from a request if available"""
@@ -31,6 +50,31 @@ class Auth:
         """Returns authorized user from a request if available"""
         return None
 
+    def credentials(self, request=None) -> str:
+        """Returns the credentials carried by a request"""
+        return self.authorization_header(request) or \
+            self.session_cookie(request)
+
+    def resolve(self, request, excluded_paths: List[str]) -> AuthResult:
+        """Authenticates a request once, timing each stage"""
+        timings: dict = {}
+        start: float = time.perf_counter()
+        required: bool = self.require_auth(request.path, excluded_paths)
+        timings["require_auth"], start = time.perf_counter() - start, \
+            time.perf_counter()
+        if not required:
+            return AuthResult(None, None, timings)
+        credentials: str = self.credentials(request)
+        timings["credentials"], start = time.perf_counter() - start, \
+            time.perf_counter()
+        if not credentials:
+            return AuthResult(None, MISSING_CREDENTIALS, timings)
+        user = self.current_user(request)
+        timings["current_user"] = time.perf_counter() - start
+        if user is None:
+            return AuthResult(None, INVALID_CREDENTIALS, timings)
+        return AuthResult(user, None, timings)
+
     def session_cookie(self, request=None) -> str:
         """Returns a cookie value from a request"""
         if request is None:
@@ -4,23 +4,44 @@ Module for basic authentication handling
 """
 
 from api.v1.auth.auth import Auth
+from api.v1.auth.cache import TTLCache
 from models.user import User
 import base64
+import binascii
+import hashlib
+import hmac
+import os
 import re
 from typing import Tuple, TypeVar
 
+CREDENTIALS_CACHE_SIZE = int(os.getenv("BASIC_AUTH_CACHE_SIZE", 1024))
+CREDENTIALS_CACHE_TTL = float(os.getenv("BASIC_AUTH_CACHE_TTL", 60))
+BASIC_TOKEN = re.compile("(?<=Basic\\s).*")
+
 
 class BasicAuth(Auth):
     """Basic authentication scheme"""
 
+    def __init__(self):
+        """Initializes the cache of verified credentials"""
+        self.credentials_cache = TTLCache(CREDENTIALS_CACHE_SIZE,
+                                          CREDENTIALS_CACHE_TTL)
+        # headers are cached under a keyed hash, never in clear
+        self.__cache_key: bytes = os.urandom(32)
+
+    def credentials(self, request=None) -> str:
+        """Returns the authorization header of a request"""
+        return self.authorization_header(request)
+
     def extract_base64_authorization_header(self,
                                             authorization_header: str) -> str:
         """Returns base64 part of authorization header"""
         if authorization_header is None or \
-            not isinstance(authorization_header, str) or \
-                not re.search("Basic\\s.*", authorization_header):
+                not isinstance(authorization_header, str):
+            return None
+        result = BASIC_TOKEN.search(authorization_header)
+        if not result:
             return None
-        result: str = re.search("(?<=Basic\\s).*", authorization_header)
         return str(result.group(0))
 
     def decode_base64_authorization_header(self,
@@ -31,9 +52,8 @@ class BasicAuth(Auth):
             if base64_authorization_header is None or \
                     not isinstance(base64_authorization_header, str):
                 return None
-            if re.search("Basic\\s.*", base64_authorization_header):
-                result: str = re.search("(?<=Basic\\s).*",
-                                        base64_authorization_header)
+            result = BASIC_TOKEN.search(base64_authorization_header)
+            if result:
                 base64_string: str = result.group(0)
             else:
                 base64_string: str = base64_authorization_header.strip()
@@ -50,7 +70,26 @@ class BasicAuth(Auth):
                 not isinstance(decoded_base64_authorization_header, str) or \
                 ":" not in decoded_base64_authorization_header:
             return None, None
-        return tuple(re.split(":", decoded_base64_authorization_header))
+        return tuple(decoded_base64_authorization_header.split(":", 1))
+
+    def extract_credentials(self, authorization_header: str) \
+            -> Tuple[str, str]:
+        """Returns the user email and password of an authorization header
+        in a single pass, without the intermediate strings and regular
+        expressions of the extract/decode/extract chain"""
+        if not isinstance(authorization_header, str) or \
+                not authorization_header.startswith("Basic "):
+            return None, None
+        try:
+            decoded: str = binascii.a2b_base64(authorization_header[6:]) \
+                .decode("utf-8")
+        except ValueError:
+            # binascii.Error, UnicodeDecodeError, or a non-ASCII header
+            return None, None
+        email, sep, password = decoded.partition(":")
+        if not sep:
+            return None, None
+        return email, password
 
     def user_object_from_credentials(self, user_email: str, user_pwd: str) \
             -> TypeVar('User'):
@@ -71,17 +110,27 @@ class BasicAuth(Auth):
     def current_user(self, request=None) -> TypeVar('User'):
         """Retrieves the user instance for a request"""
         auth_header: str = self.authorization_header(request)
-        if auth_header:
-            base64_string: str = self \
-                .extract_base64_authorization_header(auth_header)
-            if base64_string:
-                decoded_string: str = self \
-                    .decode_base64_authorization_header(base64_string)
-                if decoded_string:
-                    email, password = self \
-                        .extract_user_credentials(decoded_string)
-                    if email and password:
-                        user: User = self \
-                            .user_object_from_credentials(email, password)
-                        return user
+        if not auth_header:
+            return None
+        key: bytes = hmac.new(self.__cache_key, auth_header.encode("utf-8"),
+                              hashlib.sha256).digest()
+        cached: tuple = self.credentials_cache.get(key)
+        if cached:
+            user: User = User.get(cached[0])
+            # the user may have been removed or changed its credentials
+            if user is not None and (user.email, user.password) == cached[1:]:
+                return user
+            self.credentials_cache.pop(key)
+        user: User = self.verify_authorization_header(auth_header)
+        if user:
+            self.credentials_cache.set(key,
+                                       (user.id, user.email, user.password))
+        return user
+
+    def verify_authorization_header(self, auth_header: str) \
+            -> TypeVar('User'):
+        """Retrieves the user instance matching an authorization header"""
+        email, password = self.extract_credentials(auth_header)
+        if email and password:
+            return self.user_object_from_credentials(email, password)
         return None
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Module for a Bloom filter
+"""
+
+import hashlib
+
+
+class BloomFilter:
+    """Compact set membership with false positives but no false negatives
+
+    `size` bits are set by `hashes` positions derived from one SHA-256
+    digest of each item (double hashing).
+    """
+
+    def __init__(self, size: int = 1 << 20, hashes: int = 7):
+        """Initializes an empty filter"""
+        self.size: int = size
+        self.hashes: int = hashes
+        self.__bits = bytearray((size + 7) // 8)
+
+    def __positions(self, item: str) -> list:
+        """Returns the bit positions of an item"""
+        digest: bytes = hashlib.sha256(item.encode("utf-8")).digest()
+        h1: int = int.from_bytes(digest[:8], "big")
+        h2: int = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """Adds an item"""
+        for position in self.__positions(item):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        """Checks if an item may have been added"""
+        return all(self.__bits[position >> 3] & (1 << (position & 7))
+                   for position in self.__positions(item))
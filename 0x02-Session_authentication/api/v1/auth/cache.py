@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Module for in-memory caches used by the authentication schemes
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+import threading
+import time
+
+
+class TTLCache:
+    """Bounded cache whose entries expire after a time to live
+
+    Once `max_size` entries are held, the least recently used one is
+    dropped to make room for a new one. `on_evict(key, value)` is called
+    for every entry leaving the cache, whatever the reason.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60,
+                 on_evict: Callable[[Hashable, Any], None] = None):
+        """Initializes an empty cache"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value of a key if present and not expired"""
+        evicted: list = []
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                evicted.append((key, self.__entries.pop(key)[0]))
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+        self.__evicted(evicted)
+        return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float = None) -> None:
+        """Stores the value of a key for `ttl` seconds (by default the
+        ttl of the cache)"""
+        if self.max_size <= 0:
+            return
+        if ttl is None:
+            ttl = self.ttl
+        evicted: list = []
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic() + ttl)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                evicted.append(self.__entries.popitem(last=False))
+        self.__evicted([(k, entry[0]) for k, entry in evicted])
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes a key and returns its value"""
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+        if entry is None:
+            return default
+        self.__evicted([(key, entry[0])])
+        return entry[0]
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters and the size of the cache"""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.__entries)}
+
+    def __evicted(self, entries: list) -> None:
+        """Calls on_evict for entries removed from the cache"""
+        if self.on_evict is not None:
+            for key, value in entries:
+                self.on_evict(key, value)
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        """Returns the number of entries, expired ones included"""
+        return len(self.__entries)
+
+
+class SessionUserCache:
+    """Cache resolving session IDs directly to User instances
+
+    The first level maps a session ID to its user; the second maps a user
+    ID to the session IDs cached for it, so that all the entries of a user
+    can be dropped when the user is saved or removed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60):
+        """Initializes an empty cache"""
+        self.__users = TTLCache(max_size, ttl, self.__forget)
+        self.__sessions_by_user: dict = {}
+        self.__lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache holds any entry at all"""
+        return self.__users.max_size > 0
+
+    def get(self, session_id: str) -> TypeVar('User'):
+        """Returns the cached user of a session"""
+        return self.__users.get(session_id)
+
+    def set(self, session_id: str, user: TypeVar('User'),
+            ttl: float = None) -> None:
+        """Caches the user of a session for the ttl of the cache, or for
+        `ttl` seconds if shorter"""
+        if not self.enabled:
+            return
+        if ttl is not None:
+            ttl = min(ttl, self.__users.ttl)
+        with self.__lock:
+            self.__sessions_by_user.setdefault(user.id, set()).add(session_id)
+            self.__users.set(session_id, user, ttl)
+
+    def discard_session(self, session_id: str) -> None:
+        """Drops the entry of a session"""
+        self.__users.pop(session_id)
+
+    def discard_user(self, user_id: str) -> None:
+        """Drops the entries of all the sessions of a user"""
+        with self.__lock:
+            session_ids: set = self.__sessions_by_user.pop(user_id, set())
+            for session_id in session_ids:
+                self.__users.pop(session_id)
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters and the size of the cache"""
+        return self.__users.stats()
+
+    def __forget(self, session_id: str, user: TypeVar('User')) -> None:
+        """Drops a session ID leaving the first level from the second"""
+        with self.__lock:
+            session_ids: set = self.__sessions_by_user.get(user.id)
+            if session_ids is not None:
+                session_ids.discard(session_id)
+                if not session_ids:
+                    del self.__sessions_by_user[user.id]
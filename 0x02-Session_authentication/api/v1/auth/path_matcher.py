@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Module for matching request paths against path patterns
+"""
+
+from typing import List
+import re
+
+END = "\\0end"
+PREFIX = "\\0prefix"
+
+
+class PathMatcher:
+    """Set of path patterns compiled once into a character trie
+
+    Trailing slashes are ignored on both patterns and paths. A `*` at the
+    end of a pattern matches any remainder of the path (`/api/v1/stat*`
+    matches `/api/v1/status` and `/api/v1/stats/`); a `*` elsewhere matches
+    any part of a single path segment. Matching a path costs one trie walk,
+    whatever the number of patterns without inner wildcards.
+    """
+
+    def __init__(self, patterns: List[str] = ()):
+        """Compiles the patterns"""
+        self.__root: dict = {}
+        self.__regexes: list = []
+        self.__count: int = 0
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str) -> None:
+        """Adds a pattern"""
+        pattern = pattern.rstrip("/")
+        self.__count += 1
+        star: int = pattern.find("*")
+        if 0 <= star < len(pattern) - 1:
+            if pattern.endswith("*"):
+                body, tail = pattern[:-1], ".*"
+            else:
+                body, tail = pattern, "/*"
+            parts: list = [re.escape(part) for part in body.split("*")]
+            self.__regexes.append(re.compile("[^/]*".join(parts) + tail))
+            return
+        node: dict = self.__root
+        for char in pattern.rstrip("*"):
+            node = node.setdefault(char, {})
+        node[PREFIX if star >= 0 else END] = True
+
+    def match(self, path: str) -> bool:
+        """Checks if a path matches one of the patterns"""
+        node: dict = self.__root
+        for char in path.rstrip("/"):
+            if PREFIX in node:
+                return True
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            if END in node or PREFIX in node:
+                return True
+        for regex in self.__regexes:
+            if regex.fullmatch(path):
+                return True
+        return False
+
+    def __contains__(self, path: str) -> bool:
+        """Checks if a path matches one of the patterns"""
+        return self.match(path)
+
+    def __len__(self) -> int:
+        """Returns the number of patterns"""
+        return self.__count
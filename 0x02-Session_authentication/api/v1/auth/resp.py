@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Module for a Redis protocol (RESP) client with connection pooling
+"""
+
+from typing import Any, List
+from urllib.parse import urlparse
+import queue
+import socket
+import threading
+
+
+class RESPError(Exception):
+    """Error reply of the server"""
+
+
+def encode_command(*args: Any) -> bytes:
+    """Returns a command encoded as a RESP array of bulk strings"""
+    parts: list = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def read_reply(f) -> Any:
+    """Reads one reply from a buffered socket file; error replies are
+    returned as RESPError instances"""
+    line: bytes = f.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed by the server")
+    kind, data = line[:1], line[1:-2]
+    if kind == b"+":
+        return data.decode("utf-8")
+    if kind == b"-":
+        return RESPError(data.decode("utf-8"))
+    if kind == b":":
+        return int(data)
+    if kind == b"$":
+        length: int = int(data)
+        if length < 0:
+            return None
+        value: bytes = f.read(length + 2)
+        return value[:-2].decode("utf-8")
+    if kind == b"*":
+        length = int(data)
+        if length < 0:
+            return None
+        return [read_reply(f) for _ in range(length)]
+    raise ConnectionError("invalid reply: {!r}".format(line))
+
+
+class RESPClient:
+    """Client for a Redis compatible server
+
+    Up to `pool_size` connections are opened on demand and reused; a
+    caller waits for a free connection beyond that. `pipeline` sends a
+    batch of commands in a single write and then reads all the replies.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0",
+                 pool_size: int = 8, timeout: float = 5):
+        """Configures the client, without connecting yet"""
+        parsed = urlparse(url)
+        self.host: str = parsed.hostname or "localhost"
+        self.port: int = parsed.port or 6379
+        self.password: str = parsed.password
+        self.db: int = int(parsed.path.strip("/") or 0)
+        self.timeout: float = timeout
+        self.__idle: queue.LifoQueue = queue.LifoQueue()
+        self.__slots = threading.BoundedSemaphore(pool_size)
+
+    def __connect(self) -> tuple:
+        """Opens and sets up a new connection"""
+        sock = socket.create_connection((self.host, self.port),
+                                        self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn: tuple = (sock, sock.makefile("rb"))
+        setup: list = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in self.__send(conn, setup):
+                if isinstance(reply, RESPError):
+                    self.__close(conn)
+                    raise reply
+        return conn
+
+    def __send(self, conn: tuple, commands: List[tuple]) -> list:
+        """Sends commands on a connection and reads their replies"""
+        sock, f = conn
+        sock.sendall(b"".join(encode_command(*c) for c in commands))
+        return [read_reply(f) for _ in commands]
+
+    def __close(self, conn: tuple) -> None:
+        """Closes a connection"""
+        for part in reversed(conn):
+            try:
+                part.close()
+            except OSError:
+                pass
+
+    def pipeline(self, commands: List[tuple]) -> list:
+        """Runs commands in one round trip and returns their replies,
+        error replies being returned as RESPError instances"""
+        with self.__slots:
+            try:
+                conn: tuple = self.__idle.get_nowait()
+            except queue.Empty:
+                conn = self.__connect()
+            try:
+                replies: list = self.__send(conn, commands)
+            except (OSError, ConnectionError):
+                # the pooled connection may have been dropped: retry once
+                self.__close(conn)
+                conn = self.__connect()
+                try:
+                    replies = self.__send(conn, commands)
+                except BaseException:
+                    self.__close(conn)
+                    raise
+            except BaseException:
+                self.__close(conn)
+                raise
+            self.__idle.put(conn)
+        return replies
+
+    def execute(self, *args: Any) -> Any:
+        """Runs one command and returns its reply"""
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RESPError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        """Closes the idle connections"""
+        while True:
+            try:
+                self.__close(self.__idle.get_nowait())
+            except queue.Empty:
+                return
@@ -4,14 +4,69 @@ Module for session authentication handling
 """
 
 from api.v1.auth.auth import Auth
+from api.v1.auth.cache import SessionUserCache
 from models.user import User
 from typing import TypeVar
 from uuid import uuid4
+import os
+import time
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", 1024))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", 60))
+SESSION_DURATION = os.getenv("SESSION_DURATION", None)
 
 
 class SessionAuth(Auth):
-    """Session authentication scheme"""
+    """Session authentication scheme
+
+    The sessions and the cache of their users are class attributes, shared
+    by all the instances: the views reach the scheme through
+    `from api.v1.app import auth`, which creates a second instance when the
+    app is run with `python3 -m api.v1.app`.
+    """
     user_id_by_session_id: dict = {}
+    user_cache: SessionUserCache = SessionUserCache(SESSION_CACHE_SIZE,
+                                                    SESSION_CACHE_TTL)
+    __listening: set = set()
+
+    def __init__(self):
+        """Drops the cached sessions of the users saved or removed"""
+        if type(self) not in SessionAuth.__listening:
+            SessionAuth.__listening.add(type(self))
+            User.add_listener(type(self).user_changed)
+
+    @staticmethod
+    def configured_duration() -> int:
+        """Returns SESSION_DURATION in seconds, 0 if it is not set or not
+        a number"""
+        try:
+            return int(SESSION_DURATION)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def shared_store_cache(ttl: float) -> SessionUserCache:
+        """Returns the user cache of a scheme keeping its sessions in a
+        store shared by all the processes serving the API: any of them can
+        destroy a session, so users are only cached if `ttl` is set, and
+        for `ttl` seconds at most"""
+        if ttl <= 0:
+            return SessionUserCache(0, 0)
+        return SessionUserCache(SESSION_CACHE_SIZE, ttl)
+
+    @classmethod
+    def user_changed(cls, event: str, user: User) -> None:
+        """Drops the cached sessions of a user saved or removed"""
+        cls.user_cache.discard_user(user.id)
+
+    def session_expires_at(self, session_id: str) -> float:
+        """Returns the expiry timestamp of a session, None if it does not
+        expire"""
+        return None
+
+    def credentials(self, request=None) -> str:
+        """Returns the session cookie of a request"""
+        return self.session_cookie(request)
 
     def create_session(self, user_id: str = None) -> str:
         """Creates a session id for a user id"""
@@ -30,10 +85,19 @@ class SessionAuth(Auth):
     def current_user(self, request=None) -> TypeVar("User"):
         """Returns a user instance based on a cookie value"""
         session_id: str = self.session_cookie(request)
-        if session_id:
-            user_id: str = SessionAuth.user_id_by_session_id.get(session_id)
-            return User.get(user_id)
-        return None
+        if not session_id:
+            return None
+        user: User = self.user_cache.get(session_id)
+        if user is not None:
+            return user
+        user_id: str = self.user_id_for_session_id(session_id)
+        user = User.get(user_id)
+        # the expiry may cost a lookup in the session store
+        if user is not None and self.user_cache.enabled:
+            expires_at: float = self.session_expires_at(session_id)
+            self.user_cache.set(session_id, user, None if expires_at is None
+                                else expires_at - time.time())
+        return user
 
     def destroy_session(self, request=None) -> bool:
         """Deletes the user session on logout"""
@@ -42,8 +106,8 @@ class SessionAuth(Auth):
         session_id: str = self.session_cookie(request)
         if session_id is None:
             return False
+        self.user_cache.discard_session(session_id)
         user_id: str = self.user_id_for_session_id(session_id)
         if user_id is None:
             return False
-        del self.user_id_by_session_id[session_id]
-        return True
+        return self.user_id_by_session_id.pop(session_id, None) is not None
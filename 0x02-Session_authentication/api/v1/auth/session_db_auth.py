@@ -3,32 +3,65 @@
 Module for session authentication handling
 """
 
-from .session_exp_auth import SessionExpAuth
-from models.user_session import UserSession
+from .session_exp_auth import SessionExpAuth, SESSION_EXPIRY_RESOLUTION
+from .session_store import SessionStore
+from uuid import uuid4
+import os
+import time
+
+SESSION_DB_CACHE_TTL = float(os.getenv("SESSION_DB_CACHE_TTL", 0))
 
 
 class SessionDBAuth(SessionExpAuth):
-    """Session authentication scheme with database storage"""
+    """Session authentication scheme with database storage
+
+    Sessions are rows of a SessionStore table rather than UserSession
+    objects, so each login, lookup and logout touches a single row.
+    """
+
+    user_cache = SessionExpAuth.shared_store_cache(SESSION_DB_CACHE_TTL)
+
+    def __init__(self):
+        """Opens the session table"""
+        self.store = SessionStore()
+        super().__init__()
+
+    def start_expiry(self) -> SessionStore:
+        """Purges the expired sessions from the table in the background"""
+        self.store.purge_every(SESSION_EXPIRY_RESOLUTION,
+                               self.session_duration)
+        return self.store
 
     def create_session(self, user_id=None):
         """Creates a session id for a user id"""
-        session_id = super().create_session(user_id)
-        if not session_id:
+        if not isinstance(user_id, str):
             return None
-        session_dictionary = {
-            "user_id": user_id,
-            "session_id": session_id
-        }
-        user = UserSession(**session_dictionary)
-        user.save()
+        session_id = str(uuid4())
+        self.store.create(session_id, user_id, time.time())
         return session_id
 
+    def session_expires_at(self, session_id):
+        """Returns the expiry timestamp of a session, None if it does not
+        expire"""
+        if self.session_duration <= 0 or not isinstance(session_id, str):
+            return None
+        session = self.store.get(session_id)
+        if session is None:
+            return None
+        return session[1] + self.session_duration
+
     def user_id_for_session_id(self, session_id=None):
         """Returns a user_id based on session_id"""
-        user_id = UserSession.search({"session_id": session_id})
-        if user_id:
-            return user_id
-        return None
+        if not isinstance(session_id, str):
+            return None
+        session = self.store.get(session_id)
+        if session is None:
+            return None
+        user_id, created_at = session
+        if self.session_duration > 0 and \
+                created_at + self.session_duration < time.time():
+            return None
+        return user_id
 
     def destroy_session(self, request=None):
         """Deletes the user session on logout"""
@@ -37,8 +70,5 @@ class SessionDBAuth(SessionExpAuth):
         session_id = self.session_cookie(request)
         if not session_id:
             return False
-        user_session = UserSession.search({"session_id": session_id})
-        if user_session:
-            user_session[0].remove()
-            return True
-        return False
+        self.user_cache.discard_session(session_id)
+        return self.store.delete(session_id)
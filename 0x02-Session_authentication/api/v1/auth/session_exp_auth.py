@@ -4,10 +4,11 @@ Module for session authentication handling
 """
 
 from api.v1.auth.session_auth import SessionAuth
+from api.v1.auth.session_expiry import SessionExpiry
 import os
 from datetime import datetime, timedelta
 
-SESSION_DURATION = os.getenv("SESSION_DURATION", None)
+SESSION_EXPIRY_RESOLUTION = float(os.getenv("SESSION_EXPIRY_RESOLUTION", 1))
 
 
 class SessionExpAuth(SessionAuth):
@@ -15,10 +16,17 @@ class SessionExpAuth(SessionAuth):
 
     def __init__(self):
         """Initializes instances with required attributes"""
-        try:
-            self.session_duration = int(SESSION_DURATION)
-        except BaseException:
-            self.session_duration = 0
+        super().__init__()
+        self.session_duration = self.configured_duration()
+        # expired sessions are evicted in the background, not only ignored
+        self.expiry = None
+        if self.session_duration > 0:
+            self.expiry = self.start_expiry()
+
+    def start_expiry(self):
+        """Starts evicting the expired sessions in the background"""
+        return SessionExpiry(self.user_id_by_session_id,
+                             SESSION_EXPIRY_RESOLUTION)
 
     def create_session(self, user_id: str = None) -> str:
         """Creates a session id for a user id"""
@@ -28,12 +36,27 @@ class SessionExpAuth(SessionAuth):
         if user_id is None:
             return None
         session_dictionary = {
-            "user_id ": user_id,
+            "user_id": user_id,
             "created_at": datetime.now()
         }
         self.user_id_by_session_id[session_id] = session_dictionary
+        if self.expiry is not None:
+            expires_at = session_dictionary["created_at"] + \
+                timedelta(seconds=self.session_duration)
+            self.expiry.track(session_id, expires_at.timestamp())
         return session_id
 
+    def session_expires_at(self, session_id: str) -> float:
+        """Returns the expiry timestamp of a session, None if it does not
+        expire"""
+        if self.session_duration <= 0:
+            return None
+        sd = self.user_id_by_session_id.get(session_id)
+        if not isinstance(sd, dict) or "created_at" not in sd:
+            return None
+        return (sd["created_at"] +
+                timedelta(seconds=self.session_duration)).timestamp()
+
     def user_id_for_session_id(self, session_id: str = None) -> str:
         """Returns a user_id based on session_id"""
         if not isinstance(session_id, str) or \
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Module for the active expiry of sessions
+"""
+
+from typing import Dict
+import math
+import threading
+import time
+
+
+class SessionExpiry:
+    """Evicts sessions from a session dictionary once they expire
+
+    Sessions are filed in buckets by expiry tick (`resolution` seconds
+    wide), so tracking a session is O(1) and a sweep only visits the
+    buckets whose tick has passed. A background thread sweeps every tick.
+    """
+
+    def __init__(self, sessions: Dict[str, dict], resolution: float = 1):
+        """Starts sweeping a session dictionary"""
+        self.sessions: Dict[str, dict] = sessions
+        self.resolution: float = resolution
+        self.evicted: int = 0
+        self.__buckets: Dict[int, Dict[str, float]] = {}
+        self.__lock = threading.Lock()
+        self.__next_tick: int = self.__tick(time.time())
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __tick(self, timestamp: float) -> int:
+        """Returns the tick of a timestamp"""
+        return math.ceil(timestamp / self.resolution)
+
+    def track(self, session_id: str, expires_at: float) -> None:
+        """Schedules the eviction of a session at a timestamp"""
+        tick: int = self.__tick(expires_at)
+        with self.__lock:
+            tick = max(tick, self.__next_tick)
+            self.__buckets.setdefault(tick, {})[session_id] = expires_at
+
+    def sweep(self, now: float = None) -> int:
+        """Evicts the sessions expired at `now` and returns their number"""
+        if now is None:
+            now = time.time()
+        evicted: int = 0
+        with self.__lock:
+            last_tick: int = self.__tick(now)
+            ticks: list = [tick for tick in self.__buckets
+                           if tick <= last_tick] \
+                if len(self.__buckets) < last_tick - self.__next_tick \
+                else range(self.__next_tick, last_tick + 1)
+            due: list = [self.__buckets.pop(tick) for tick in ticks
+                         if tick in self.__buckets]
+            self.__next_tick = max(self.__next_tick, last_tick)
+        for bucket in due:
+            for session_id, expires_at in bucket.items():
+                if expires_at > now:
+                    self.track(session_id, expires_at)
+                elif self.sessions.pop(session_id, None) is not None:
+                    evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def stop(self) -> None:
+        """Stops the background sweeps"""
+        self.__stop.set()
+
+    def __len__(self) -> int:
+        """Returns the number of sessions tracked"""
+        return sum(len(bucket) for bucket in self.__buckets.values())
+
+    def __run(self) -> None:
+        """Sweeps every tick"""
+        while not self.__stop.wait(self.resolution):
+            self.sweep()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Module for session authentication handling with a shared session store
+"""
+
+from api.v1.auth.resp import RESPClient
+from api.v1.auth.session_auth import SessionAuth
+from typing import List
+from uuid import uuid4
+import os
+import time
+
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "redis://localhost:6379/0")
+SESSION_STORE_POOL_SIZE = int(os.getenv("SESSION_STORE_POOL_SIZE", 8))
+SESSION_STORE_PREFIX = os.getenv("SESSION_STORE_PREFIX", "session:")
+SESSION_STORE_CACHE_TTL = float(os.getenv("SESSION_STORE_CACHE_TTL", 0))
+
+
+class SessionRedisAuth(SessionAuth):
+    """Session authentication scheme storing the sessions in a Redis
+    compatible server shared by all the processes serving the API"""
+    user_cache = SessionAuth.shared_store_cache(SESSION_STORE_CACHE_TTL)
+
+    def __init__(self, client: RESPClient = None):
+        """Initializes the client of the session store"""
+        super().__init__()
+        self.client: RESPClient = client or RESPClient(
+            SESSION_STORE_URL, SESSION_STORE_POOL_SIZE)
+        self.session_duration = self.configured_duration()
+
+    def __key(self, session_id: str) -> str:
+        """Returns the store key of a session"""
+        return SESSION_STORE_PREFIX + session_id
+
+    def create_session(self, user_id: str = None) -> str:
+        """Creates a session id for a user id"""
+        if user_id is None or not isinstance(user_id, str):
+            return None
+        session_id: str = str(uuid4())
+        command: list = ["SET", self.__key(session_id), user_id]
+        if self.session_duration > 0:
+            command += ["EX", self.session_duration]
+        self.client.execute(*command)
+        return session_id
+
+    def user_id_for_session_id(self, session_id: str = None) -> str:
+        """Returns a user_id based on session_id"""
+        if session_id is None or not isinstance(session_id, str):
+            return None
+        return self.client.execute("GET", self.__key(session_id))
+
+    def user_ids_for_session_ids(self, session_ids: List[str]) \
+            -> List[str]:
+        """Returns the user_id of several sessions in one round trip"""
+        replies: list = self.client.pipeline(
+            [("GET", self.__key(session_id)) for session_id in session_ids])
+        return [reply if isinstance(reply, str) else None
+                for reply in replies]
+
+    def session_expires_at(self, session_id: str) -> float:
+        """Returns the expiry timestamp of a session, None if it does not
+        expire"""
+        if self.session_duration <= 0:
+            return None
+        ttl: int = self.client.execute("TTL", self.__key(session_id))
+        return time.time() + ttl if ttl >= 0 else None
+
+    def destroy_session(self, request=None) -> bool:
+        """Deletes the user session on logout"""
+        if request is None:
+            return False
+        session_id: str = self.session_cookie(request)
+        if session_id is None:
+            return False
+        self.user_cache.discard_session(session_id)
+        return self.client.execute("DEL", self.__key(session_id)) == 1
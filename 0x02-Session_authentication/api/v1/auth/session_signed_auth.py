@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Module for stateless session authentication with signed session IDs
+"""
+
+from api.v1.auth.bloom import BloomFilter
+from api.v1.auth.session_auth import SessionAuth
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+# must be shared by all the processes serving the API; a random secret
+# only works for a single process and is lost on restart
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+SESSION_REVOCATION_BITS = int(os.getenv("SESSION_REVOCATION_BITS", 1 << 20))
+# a signed session cannot be deleted: it expires after this many seconds
+# when SESSION_DURATION is not set
+DEFAULT_SESSION_DURATION = 3600
+
+
+def b64encode(data: bytes) -> str:
+    """Returns unpadded URL-safe base64"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64decode(data: str) -> bytes:
+    """Decodes unpadded URL-safe base64"""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionSignedAuth(SessionAuth):
+    """Session authentication scheme without a session store
+
+    The session ID is `<payload>.<signature>`: the payload holds the user
+    ID, the issue time, the expiry time and a random nonce telling apart
+    the sessions issued in the same second, and the signature is its
+    HMAC-SHA256 under SESSION_SECRET. Verifying a session needs no lookup.
+    Every session expires, after SESSION_DURATION seconds or
+    DEFAULT_SESSION_DURATION if it is not set.
+
+    Logged out sessions are added to a Bloom filter, checked before
+    accepting a session: a false positive only forces a new login. The
+    filter is renewed every session duration (the previous one is kept one
+    more period), since older sessions have expired anyway. It lives in the
+    memory of the process: a logout only applies to the process that
+    served it, and is forgotten on restart, so the session stays valid
+    elsewhere until it expires. Like the sessions of SessionAuth, the key
+    and the filters are shared by all the instances of the process.
+    """
+    __key: bytes = SESSION_SECRET.encode("utf-8") if SESSION_SECRET \
+        else os.urandom(32)
+    __revoked: list = [BloomFilter(SESSION_REVOCATION_BITS)] \
+        if SESSION_REVOCATION_BITS > 0 else []
+    __revoked_since: float = time.time()
+    __lock = threading.Lock()
+
+    def __init__(self):
+        """Initializes the session duration"""
+        super().__init__()
+        self.session_duration = self.configured_duration() or \
+            DEFAULT_SESSION_DURATION
+
+    def __sign(self, payload: str) -> str:
+        """Returns the signature of a payload"""
+        return b64encode(hmac.new(self.__key, payload.encode("ascii"),
+                                  hashlib.sha256).digest())
+
+    def create_session(self, user_id: str = None) -> str:
+        """Creates a signed session id for a user id"""
+        if user_id is None or not isinstance(user_id, str):
+            return None
+        issued_at: int = int(time.time())
+        expires_at: int = issued_at + self.session_duration
+        payload: str = b64encode("{}|{}|{}|{}".format(
+            user_id, issued_at, expires_at,
+            os.urandom(6).hex()).encode("utf-8"))
+        return "{}.{}".format(payload, self.__sign(payload))
+
+    def __verify(self, session_id: str) -> tuple:
+        """Returns the (user id, issue time, expiry time) of a session id
+        with a valid signature, None otherwise"""
+        # the signature is computed and compared over ASCII only
+        if not isinstance(session_id, str) or not session_id.isascii():
+            return None
+        payload, _, signature = session_id.partition(".")
+        if not hmac.compare_digest(self.__sign(payload), signature):
+            return None
+        try:
+            user_id, issued_at, expires_at, _ = b64decode(payload) \
+                .decode("utf-8").rsplit("|", 3)
+            return user_id, int(issued_at), int(expires_at)
+        except (binascii.Error, ValueError):
+            return None
+
+    def user_id_for_session_id(self, session_id: str = None) -> str:
+        """Returns a user_id based on session_id"""
+        claims: tuple = self.__verify(session_id)
+        if claims is None:
+            return None
+        user_id, _, expires_at = claims
+        if expires_at <= time.time():
+            return None
+        if any(session_id in revoked for revoked in self.__revoked):
+            return None
+        return user_id
+
+    def session_expires_at(self, session_id: str) -> float:
+        """Returns the expiry timestamp of a session"""
+        claims: tuple = self.__verify(session_id)
+        if claims is None:
+            return None
+        return claims[2]
+
+    def destroy_session(self, request=None) -> bool:
+        """Revokes the user session on logout, in this process only"""
+        if request is None:
+            return False
+        session_id: str = self.session_cookie(request)
+        if self.user_id_for_session_id(session_id) is None:
+            return False
+        self.user_cache.discard_session(session_id)
+        if not self.__revoked:
+            return False
+        with self.__lock:
+            if time.time() - self.__revoked_since >= self.session_duration:
+                SessionSignedAuth.__revoked = [
+                    BloomFilter(SESSION_REVOCATION_BITS), self.__revoked[0]]
+                SessionSignedAuth.__revoked_since = time.time()
+            self.__revoked[0].add(session_id)
+        return True
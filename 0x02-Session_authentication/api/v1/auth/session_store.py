@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Module for the persistence of database sessions
+"""
+
+from typing import Tuple
+import os
+import sqlite3
+import threading
+import time
+
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", ".db_sessions.sqlite3")
+SESSION_PURGE_BATCH = int(os.getenv("SESSION_PURGE_BATCH", 10000))
+
+
+class SessionStore:
+    """Table of sessions in a SQLite database
+
+    Rows are keyed by session ID, so creating, reading and deleting a
+    session is one B-tree operation whatever the number of sessions, and
+    the index on the creation time lets expired sessions be deleted in
+    bulk, oldest first, without scanning the live ones.
+    """
+
+    def __init__(self, file_path: str = SESSION_DB_PATH):
+        """Opens (and creates if needed) the session table"""
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.purged: int = 0
+        self.__db = sqlite3.connect(file_path, check_same_thread=False,
+                                    isolation_level=None)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY,"
+            " user_id TEXT NOT NULL, created_at REAL NOT NULL) WITHOUT ROWID")
+        self.__db.execute("CREATE INDEX IF NOT EXISTS sessions_created_at "
+                          "ON sessions (created_at)")
+
+    def create(self, session_id: str, user_id: str,
+               created_at: float) -> None:
+        """Stores a session"""
+        with self.__lock:
+            self.__db.execute("INSERT OR REPLACE INTO sessions VALUES "
+                              "(?, ?, ?)", (session_id, user_id, created_at))
+
+    def get(self, session_id: str) -> Tuple[str, float]:
+        """Returns the (user ID, creation time) of a session, None if
+        there is none"""
+        with self.__lock:
+            return self.__db.execute(
+                "SELECT user_id, created_at FROM sessions "
+                "WHERE session_id = ?", (session_id,)).fetchone()
+
+    def delete(self, session_id: str) -> bool:
+        """Deletes a session and returns whether it existed"""
+        with self.__lock:
+            return self.__db.execute(
+                "DELETE FROM sessions WHERE session_id = ?",
+                (session_id,)).rowcount > 0
+
+    def purge(self, created_before: float) -> int:
+        """Deletes the sessions created before a timestamp, in batches of
+        SESSION_PURGE_BATCH rows so lookups are not held up meanwhile, and
+        returns their number"""
+        purged: int = 0
+        while True:
+            with self.__lock:
+                deleted: int = self.__db.execute(
+                    "DELETE FROM sessions WHERE session_id IN (SELECT "
+                    "session_id FROM sessions WHERE created_at < ? "
+                    "ORDER BY created_at LIMIT ?)",
+                    (created_before, SESSION_PURGE_BATCH)).rowcount
+            purged += deleted
+            if deleted < SESSION_PURGE_BATCH:
+                break
+        self.purged += purged
+        return purged
+
+    def purge_every(self, interval: float, max_age: float) -> None:
+        """Purges the sessions older than `max_age` seconds every
+        `interval` seconds in the background"""
+        def run():
+            while not self.__stop.wait(interval):
+                self.purge(time.time() - max_age)
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the background purges"""
+        self.__stop.set()
+
+    def __len__(self) -> int:
+        """Returns the number of sessions stored"""
+        with self.__lock:
+            return self.__db.execute(
+                "SELECT COUNT(*) FROM sessions").fetchone()[0]
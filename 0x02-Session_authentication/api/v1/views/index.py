@@ -20,9 +20,13 @@ def stats() -> str:
     Return:
       - the number of each objects
     """
+    from api.v1.app import auth
     from models.user import User
     stats = {}
     stats['users'] = User.count()
+    for cache in ('credentials_cache', 'user_cache'):
+        if hasattr(auth, cache):
+            stats[cache] = getattr(auth, cache).stats()
     return jsonify(stats)
 
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+""" Bench basic auth: cost of parsing an Authorization header
+"""
+import base64
+import sys
+import timeit
+from api.v1.auth.basic_auth import BasicAuth
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+ba = BasicAuth()
+header = "Basic " + base64.b64encode(
+    b"bob@hbtn.io:H0lberton:School:98!").decode("utf-8")
+
+
+def chain():
+    """ extract -> decode -> extract, as current_user used to """
+    b64 = ba.extract_base64_authorization_header(header)
+    decoded = ba.decode_base64_authorization_header(b64)
+    return ba.extract_user_credentials(decoded)
+
+
+def single_pass():
+    """ extract_credentials """
+    return ba.extract_credentials(header)
+
+
+assert chain() == single_pass(), (chain(), single_pass())
+for name, func in (("chain", chain), ("extract_credentials", single_pass)):
+    elapsed = min(timeit.repeat(func, number=N, repeat=3))
+    print("{}: {:.0f} ns/header".format(name, elapsed / N * 1e9))
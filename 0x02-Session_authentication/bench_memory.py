@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" Bench memory: bytes per User/UserSession record, values excluded
+"""
+import sys
+import tracemalloc
+from models.user import User
+from models.user_session import UserSession
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+
+class DictRecord():
+    """ Record keeping its attributes in a __dict__, as the models did """
+
+    def __init__(self, **kwargs):
+        """ Set the attributes one by one, as the models' __init__ do """
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def measure(make, values: list) -> float:
+    """ Average bytes allocated to build a record from existing values """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [make(v) for v in values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / len(values)
+
+
+def make_slots(cls):
+    """ Return a builder of model instances with the given values """
+    def make(values: dict):
+        """ Build a model instance without re-creating its values """
+        obj = cls.__new__(cls)
+        for key, value in values.items():
+            setattr(obj, key, value)
+        return obj
+    return make
+
+
+for cls, fields in ((User, {"email": "user{}@hbtn.io",
+                            "_password": "{:064x}"}),
+                    (UserSession, {"user_id": "{:036x}",
+                                   "session_id": "{:036}"})):
+    values = []
+    for i in range(N):
+        obj = cls(**{k: v.format(i) for k, v in fields.items()})
+        values.append({k: getattr(obj, k) for k in obj._fields})
+    dicts = measure(lambda v: DictRecord(**v), values)
+    slots = measure(make_slots(cls), values)
+    print("{}: {:.0f} bytes/record with __dict__, {:.0f} with __slots__"
+          .format(cls.__name__, dicts, slots))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+""" Bench password verification throughput across process pool sizes,
+with 16 threads standing in for the web workers
+
+    ./bench_password_hasher.py [scheme [cost]]   (default: pbkdf2_sha256)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from models.password_hasher import PasswordHasher, SCHEMES
+import os
+import sys
+import time
+
+SCHEME = sys.argv[1] if len(sys.argv) > 1 else 'pbkdf2_sha256'
+COST = sys.argv[2] if len(sys.argv) > 2 else None
+THREADS = 16
+LOGINS = 64
+
+
+def bench(workers: int):
+    """ Verify LOGINS passwords from THREADS threads """
+    hasher = PasswordHasher(SCHEME, COST, workers)
+    hashed = hasher.hash("password")
+    with ThreadPoolExecutor(THREADS) as threads:
+        start = time.perf_counter()
+        cpu = time.process_time()
+        ok = all(threads.map(lambda _: hasher.verify("password", hashed),
+                             range(LOGINS)))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+    hasher.shutdown()
+    assert ok
+    print("{:>2} workers: {:7.1f} logins/s, {:6.1f} ms/login, web process "
+          "cpu {:5.1f} ms/login".format(workers, LOGINS / elapsed,
+                                        elapsed / LOGINS * 1e3,
+                                        cpu / LOGINS * 1e3))
+
+
+if __name__ == "__main__":
+    print("{} cost {}".format(SCHEME, COST or SCHEMES[SCHEME][2]))
+    workers = 0
+    while workers <= (os.cpu_count() or 1):
+        bench(workers)
+        workers = workers * 2 or 1
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+""" Bench SessionDBAuth: login, lookup and logout latency with the session
+table against UserSession objects, at a given number of stored sessions
+
+    ./bench_session_db.py [sizes...]   (default: 100000 1000000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+os.chdir(tempfile.mkdtemp())
+os.environ["SESSION_DURATION"] = "3600"
+from api.v1.auth.session_db_auth import SessionDBAuth  # noqa: E402
+from models.user_session import UserSession  # noqa: E402
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+OPS = 1000
+# UserSession rewrites its whole file on each change: bench fewer of them
+USER_SESSION_OPS = 10
+
+
+def per_op(fn, args: list) -> float:
+    """ Mean latency of fn over args in us """
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def report(name: str, size: int, login: float, lookup: float,
+           logout: float):
+    """ Print one line of results """
+    print("{:<12} {:>8} sessions: login {:>10.1f} us, lookup {:>8.1f} us, "
+          "logout {:>10.1f} us".format(name, size, login, lookup, logout))
+
+
+def bench_store(size: int):
+    """ Sessions in the SessionStore table """
+    auth = SessionDBAuth()
+    auth.expiry.stop()
+    now = time.time()
+    session_ids = []
+    for i in range(size):
+        session_id = str(uuid.uuid4())
+        auth.store.create(session_id, "user{}".format(i % 1000), now)
+        session_ids.append(session_id)
+    created = []
+    login = per_op(lambda user_id: created.append(
+        auth.create_session(user_id)), ["user"] * OPS)
+    lookup = per_op(auth.user_id_for_session_id,
+                    random.sample(session_ids, OPS))
+    logout = per_op(auth.store.delete, created)
+    report("table", size, login, lookup, logout)
+
+
+def bench_user_session(size: int):
+    """ Sessions as UserSession objects, as before the session table """
+    objs = UserSession._reset()
+    for i in range(size):
+        obj = UserSession(user_id="user{}".format(i % 1000),
+                          session_id=str(uuid.uuid4()))
+        objs[obj.id] = obj
+        UserSession._index_add(obj)
+    UserSession.save_to_file()
+    session_ids = [obj.session_id for obj in
+                   random.sample(list(objs.values()), OPS)]
+    created = []
+
+    def create(user_id):
+        obj = UserSession(user_id=user_id, session_id=str(uuid.uuid4()))
+        obj.save()
+        created.append(obj)
+
+    login = per_op(create, ["user"] * USER_SESSION_OPS)
+    lookup = per_op(lambda session_id: UserSession.search(
+        {"session_id": session_id}), session_ids)
+    logout = per_op(lambda obj: obj.remove(), created)
+    report("UserSession", size, login, lookup, logout)
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        bench_store(size)
+        bench_user_session(size)
+        for path in os.listdir("."):
+            os.remove(path)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+""" Bench session expiry: memory, lookup latency and eviction of
+SessionExpAuth sessions
+"""
+import os
+import random
+import resource
+import sys
+import time
+import timeit
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+os.environ["SESSION_DURATION"] = "2"
+os.environ["SESSION_EXPIRY_RESOLUTION"] = "0.5"
+from api.v1.auth.session_exp_auth import SessionExpAuth  # noqa: E402
+
+
+def rss_mb() -> float:
+    """ Peak resident memory of the process in MB (Linux) """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+sa = SessionExpAuth()
+sa.expiry.stop()
+before = rss_mb()
+start = time.perf_counter()
+session_ids = [sa.create_session("user{}".format(i % 1000)) for i in range(N)]
+elapsed = time.perf_counter() - start
+print("create: {:.2f} us/session, {:.0f} bytes/session".format(
+    elapsed / N * 1e6, (rss_mb() - before) * 1024 * 1024 / N))
+
+sample = random.sample(session_ids, min(N, 100000))
+elapsed = timeit.timeit(lambda: [sa.user_id_for_session_id(s)
+                                 for s in sample], number=1)
+print("lookup: {:.2f} us/session".format(elapsed / len(sample) * 1e6))
+
+start = time.perf_counter()
+evicted = sa.expiry.sweep(time.time() + 3)
+elapsed = time.perf_counter() - start
+print("sweep: {} sessions evicted in {:.2f}s, {} left".format(
+    evicted, elapsed, len(sa.user_id_by_session_id)))
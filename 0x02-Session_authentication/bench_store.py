@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+""" Bench store: User.get/User.search throughput by number of threads
+"""
+import sys
+import threading
+import time
+from models.base import DATA
+from models.store import Store
+from models.user import User
+
+N_USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+N_READS = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+""" Fill the registry without touching the storage engine """
+User()
+users = Store()
+for i in range(N_USERS):
+    user = User(email="user{}@hbtn.io".format(i))
+    users[user.id] = user
+DATA["User"] = users
+User._reset_indexes()
+for user in users.values():
+    User._index_add(user)
+ids = users.keys()
+
+
+def reader(n: int):
+    """ Mix of lookups by ID and by email """
+    for i in range(n):
+        User.get(ids[i % N_USERS])
+        User.search({"email": "user{}@hbtn.io".format(i % N_USERS)})
+
+
+def writer(stop: threading.Event):
+    """ Keep re-indexing users while the readers run """
+    i = 0
+    while not stop.is_set():
+        user = users[ids[i % N_USERS]]
+        with users.lock(user.id):
+            User._index_add(user)
+        i += 1
+
+
+for n_threads in (1, 2, 4, 8):
+    stop = threading.Event()
+    w = threading.Thread(target=writer, args=(stop,))
+    w.start()
+    threads = [threading.Thread(target=reader, args=(N_READS // n_threads,))
+               for _ in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    w.join()
+    print("{} threads: {:.0f} reads/s".format(n_threads, N_READS / elapsed))
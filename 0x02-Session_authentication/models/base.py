@@ -2,36 +2,69 @@
 """ Base module
 """
 from datetime import datetime
-from typing import TypeVar, List, Iterable
-from os import path
-import json
+from models.engine import storage
+from models.engine.group_commit import GroupCommit, COMMIT_WINDOW
+from models.store import Store
+from contextlib import ExitStack
+from typing import Callable, TypeVar, List, Iterable
+import os
+import threading
 import uuid
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
 DATA = {}
+INDEXES = {}
+LISTENERS = {}
+DATA_LOCK = threading.RLock()
+# bound on the instances kept in memory with a non-resident storage engine
+CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", 10000))
+
+
+def _flush_records(records: list):
+    """ Hand a batch of (class, op, obj_id, obj_json) records to the
+    storage engine, one call per class
+    """
+    batches = {}
+    for cls, op, obj_id, obj_json in records:
+        batches.setdefault(cls, []).append((op, obj_id, obj_json))
+    for cls, batch in batches.items():
+        if storage.append_many(cls.__name__, batch):
+            cls.save_to_file()
+
+
+COMMITTER = GroupCommit(_flush_records) if COMMIT_WINDOW > 0 else None
 
 
 class Base():
     """ Base class
     """
 
+    # attributes with a hash index: {attribute: {value: {obj_id: None}}}
+    indexed_attributes: tuple = ()
+    # attributes are stored in slots rather than in a per-instance __dict__
+    __slots__ = ('id', 'created_at', 'updated_at')
+    _fields: tuple = __slots__
+
+    def __init_subclass__(cls, **kwargs: dict):
+        """ Collect the slots of the class and of its parents, in order
+        """
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(field for klass in reversed(cls.__mro__)
+                            for field in klass.__dict__.get('__slots__', ()))
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
-        s_class = str(self.__class__.__name__)
-        if DATA.get(s_class) is None:
-            DATA[s_class] = {}
-
+        self.__class__._objects()
         self.id = kwargs.get('id', str(uuid.uuid4()))
+        # TIMESTAMP_FORMAT is ISO 8601: fromisoformat parses it much faster
         if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
+            self.created_at = datetime.fromisoformat(kwargs.get('created_at'))
         else:
             self.created_at = datetime.utcnow()
         if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
+            self.updated_at = datetime.fromisoformat(kwargs.get('updated_at'))
         else:
             self.updated_at = datetime.utcnow()
 
@@ -48,7 +81,10 @@ class Base():
         """ Convert the object a JSON dictionary
         """
         result = {}
-        for key, value in self.__dict__.items():
+        attributes = [(key, getattr(self, key)) for key in self._fields
+                      if hasattr(self, key)]
+        attributes += getattr(self, '__dict__', {}).items()
+        for key, value in attributes:
             if not for_serialization and key[0] == '_':
                 continue
             if isinstance(value, datetime):
@@ -62,51 +98,235 @@ class Base():
         """ Load all objects from file
         """
         s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
+        if COMMITTER is not None:
+            COMMITTER.flush()
+        objs = cls._reset()
+        for obj_id, obj_json in storage.load(s_class).items():
+            obj = cls(**obj_json)
+            objs[obj_id] = obj
+            cls._index_add(obj)
+
+    @classmethod
+    def _objects(cls) -> Store:
+        """ Return the registry of the class, creating it on first use
+        """
+        objs = DATA.get(cls.__name__)
+        if objs is None:
+            with DATA_LOCK:
+                objs = DATA.get(cls.__name__)
+                if objs is None:
+                    objs = cls._reset()
+        return objs
+
+    @classmethod
+    def _reset(cls) -> Store:
+        """ Replace the registry and indexes of the class by empty ones
+        """
+        objs = Store(max_size=None if storage.resident else CACHE_SIZE)
+        with DATA_LOCK:
+            storage.register(cls.__name__, cls.indexed_attributes)
+            cls._reset_indexes()
+            DATA[cls.__name__] = objs
+        return objs
 
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+    @classmethod
+    def _materialize(cls, obj_json: dict) -> TypeVar('Base'):
+        """ Return the registered instance of a serialized object,
+        registering a new instance if there is none
+        """
+        if obj_json is None:
+            return None
+        objs = cls._objects()
+        obj = objs.get(obj_json['id'])
+        if obj is not None:
+            return obj
+        with objs.lock(obj_json['id']):
+            obj = objs.get(obj_json['id'])
+            if obj is None:
+                obj = cls(**obj_json)
+                objs[obj.id] = obj
+                cls._index_add(obj)
+        return obj
+
+    @classmethod
+    def _sync_storage(cls):
+        """ Make the pending changes visible to a non-resident storage
+        engine before querying it
+        """
+        if COMMITTER is not None:
+            COMMITTER.flush()
 
     @classmethod
     def save_to_file(cls):
         """ Save all objects to file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        storage.write(cls.__name__, cls._objects().copy)
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def _persist(cls, op: str, obj: TypeVar('Base')):
+        """ Record a save/remove of an object in the storage engine,
+        through the group commit when MODEL_COMMIT_WINDOW_MS is set.
+        Called holding the lock of the object, so that the engine gets the
+        changes of an object in the order they were made in memory
+        """
+        obj_json = obj.to_json(True) if op == 'save' else None
+        cls._persist_records([(cls, op, obj.id, obj_json)])
+
+    @staticmethod
+    def _persist_records(records: list):
+        """ Hand (class, op, obj_id, obj_json) records to the storage
+        engine, through the group commit when MODEL_COMMIT_WINDOW_MS is set
+        """
+        if COMMITTER is not None:
+            COMMITTER.submit_many(records)
+        elif records:
+            _flush_records(records)
 
     def save(self):
         """ Save current object
         """
-        s_class = self.__class__.__name__
+        objs = self.__class__._objects()
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        with objs.lock(self.id):
+            objs[self.id] = self
+            self.__class__._index_add(self)
+            self.__class__._persist('save', self)
+        self.__class__._notify('save', self)
+
+    @classmethod
+    def save_many(cls, objs: List[TypeVar('Base')]) -> List[TypeVar('Base')]:
+        """ Save the objects of the class still registered, with one write
+        to the storage engine, and return them; the others (removed, or
+        evicted from the cache of a non-resident engine, since then) are
+        dropped rather than brought back
+        """
+        registry = cls._objects()
+        saved = []
+        records = []
+        locks = {id(lock): lock
+                 for lock in (registry.lock(obj.id) for obj in objs)}
+        with ExitStack() as stack:
+            # all the locks of the batch, always taken in the same order
+            for key in sorted(locks):
+                stack.enter_context(locks[key])
+            for obj in objs:
+                if registry.get(obj.id) is not obj:
+                    continue
+                obj.updated_at = datetime.utcnow()
+                cls._index_add(obj)
+                records.append((cls, 'save', obj.id, obj.to_json(True)))
+                saved.append(obj)
+            cls._persist_records(records)
+        for obj in saved:
+            cls._notify('save', obj)
+        return saved
 
     def remove(self):
         """ Remove object
         """
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        objs = self.__class__._objects()
+        with objs.lock(self.id):
+            if objs.pop(self.id) is None and storage.resident:
+                return
+            self.__class__._index_remove(self.id)
+            self.__class__._persist('remove', self)
+        self.__class__._notify('remove', self)
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[str, TypeVar('Base')], None]):
+        """ Call `listener(event, obj)` after each 'save' or 'remove' of an
+        object of the class
+        """
+        LISTENERS.setdefault(cls.__name__, []).append(listener)
+
+    @classmethod
+    def _notify(cls, event: str, obj: TypeVar('Base')):
+        """ Call the listeners of the class
+        """
+        for listener in LISTENERS.get(cls.__name__, ()):
+            listener(event, obj)
+
+    @classmethod
+    def _reset_indexes(cls):
+        """ Drop and recreate the hash indexes of the class
+        """
+        INDEXES[cls.__name__] = {
+            'lock': threading.RLock(),
+            'values': {},
+            'attrs': {attr: {} for attr in cls.indexed_attributes}
+        }
+
+    @classmethod
+    def _index_add(cls, obj: TypeVar('Base')):
+        """ Add (or refresh) an object in the hash indexes, which are only
+        kept for resident storage engines (the others have their own)
+        """
+        if not cls.indexed_attributes or not storage.resident:
+            return
+        index = INDEXES[cls.__name__]
+        new_values = {}
+        for attr in cls.indexed_attributes:
+            value = getattr(obj, attr, None)
+            try:
+                hash(value)
+            except TypeError:
+                continue
+            new_values[attr] = value
+        with index['lock']:
+            if index['values'].get(obj.id, {}) == new_values:
+                return
+            cls._index_remove(obj.id)
+            for attr, value in new_values.items():
+                index['attrs'][attr].setdefault(value, {})[obj.id] = None
+            index['values'][obj.id] = new_values
+
+    @classmethod
+    def _index_remove(cls, obj_id: str):
+        """ Remove an object from the hash indexes
+        """
+        index = INDEXES[cls.__name__]
+        with index['lock']:
+            old_values = index['values'].pop(obj_id, None)
+            if old_values is None:
+                return
+            for attr, value in old_values.items():
+                ids = index['attrs'][attr].get(value)
+                if ids is None:
+                    continue
+                ids.pop(obj_id, None)
+                if len(ids) == 0:
+                    del index['attrs'][attr][value]
+
+    @classmethod
+    def _index_lookup(cls, attributes: dict) -> Iterable[str]:
+        """ Return the candidate IDs for the indexed attributes of a query,
+        or None if no attribute of the query is indexed
+        """
+        candidates = None
+        attrs = INDEXES[cls.__name__]['attrs']
+        for k, v in attributes.items():
+            if k not in attrs:
+                continue
+            try:
+                ids = attrs[k].get(v, {})
+            except TypeError:
+                continue
+            if candidates is None:
+                candidates = list(ids.copy())
+            else:
+                candidates = [obj_id for obj_id in candidates
+                              if obj_id in ids]
+        return candidates
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        objs = cls._objects()
+        if not storage.resident:
+            cls._sync_storage()
+            return storage.count(cls.__name__)
+        return len(objs)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
@@ -118,14 +338,17 @@ class Base():
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        obj = cls._objects().get(id)
+        if obj is None and not storage.resident:
+            cls._sync_storage()
+            obj = cls._materialize(storage.get(cls.__name__, id))
+        return obj
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
-        s_class = cls.__name__
+        objs = cls._objects()
 
         def _search(obj):
             if len(attributes) == 0:
@@ -135,4 +358,12 @@ class Base():
                     return False
             return True
 
-        return list(filter(_search, DATA[s_class].values()))
+        if not storage.resident:
+            cls._sync_storage()
+            found = storage.find(cls.__name__, attributes)
+            return list(filter(_search, map(cls._materialize, found)))
+        candidates = cls._index_lookup(attributes)
+        if candidates is None:
+            return list(filter(_search, objs.values()))
+        found = (objs.get(obj_id) for obj_id in candidates)
+        return [obj for obj in found if obj is not None and _search(obj)]
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+""" Storage engines of the models, selected with MODEL_STORAGE
+"""
+from models.engine.group_commit import COMMIT_DURABILITY
+from models.engine.json_storage import JSONStorage
+from models.engine.journal_storage import JournalStorage
+from models.engine.lazy_json_storage import LazyJSONStorage
+from models.engine.mmap_storage import MmapStorage
+from models.engine.sqlite_storage import SQLiteStorage
+import os
+
+
+STORAGE_ENGINES = {
+    'json': JSONStorage,
+    'journal': JournalStorage,
+    'lazy': LazyJSONStorage,
+    'sqlite': SQLiteStorage,
+    'mmap': MmapStorage
+}
+
+storage = STORAGE_ENGINES[os.getenv("MODEL_STORAGE", "json")](
+    fsync=(COMMIT_DURABILITY == "sync"))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+""" Group commit module
+"""
+from typing import Callable, List
+import atexit
+import logging
+import os
+import threading
+import time
+
+
+COMMIT_WINDOW = float(os.getenv("MODEL_COMMIT_WINDOW_MS", 0)) / 1000
+COMMIT_MAX_RECORDS = int(os.getenv("MODEL_COMMIT_MAX_RECORDS", 100))
+COMMIT_DURABILITY = os.getenv("MODEL_COMMIT_DURABILITY", "async")
+
+
+class GroupCommit():
+    """ Coalesce the records submitted by many callers into batches flushed
+    by a background thread, once `window` seconds have passed since the
+    first pending record or `max_records` records are pending.
+
+    With the "sync" durability, `submit` blocks until the batch holding the
+    record has been flushed; with "async" it returns immediately.
+    The error of a failed batch is raised to every caller waiting on one of
+    its records: the "sync" submitters, and `flush` for the records that
+    were pending when it was called. It is logged when there is none.
+    """
+
+    def __init__(self, flush: Callable[[list], None],
+                 window: float = COMMIT_WINDOW,
+                 max_records: int = COMMIT_MAX_RECORDS,
+                 durability: str = COMMIT_DURABILITY):
+        """ Initialize a GroupCommit instance
+        """
+        if durability not in ("sync", "async"):
+            raise ValueError("durability must be 'sync' or 'async'")
+        self.window = window
+        self.max_records = max_records
+        self.durability = durability
+        self.__flush = flush
+        self.__cond = threading.Condition()
+        self.__pending = []
+        self.__queued = 0
+        self.__flushed = 0
+        self.__urgent = False
+        self.__waiters = []
+        self.__failures = []
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, record):
+        """ Queue a record for the next batch
+        """
+        self.submit_many([record])
+
+    def submit_many(self, records: list):
+        """ Queue records for the next batch, in order, waiting once for
+        all of them with the "sync" durability
+        """
+        if not records:
+            return
+        with self.__cond:
+            self.__pending.extend(records)
+            first = self.__queued + 1
+            self.__queued += len(records)
+            self.__cond.notify_all()
+            if self.durability == "sync":
+                self.__wait(first, self.__queued)
+
+    def flush(self):
+        """ Flush the pending records now and wait for them to be written
+        """
+        with self.__cond:
+            self.__urgent = True
+            self.__cond.notify_all()
+            self.__wait(self.__flushed + 1, self.__queued)
+
+    def __wait(self, first: int, last: int):
+        """ Wait (holding the condition) until the records `first` to `last`
+        are flushed, and raise the error of a failed batch holding one
+        """
+        waiter = (first, last)
+        self.__waiters.append(waiter)
+        try:
+            while self.__flushed < last:
+                self.__cond.wait()
+        finally:
+            self.__waiters.remove(waiter)
+        error = None
+        for failure in self.__failures:
+            if self.__overlaps(failure, waiter):
+                error = failure[2]
+        # forget the failures no one is waiting on anymore
+        self.__failures = [failure for failure in self.__failures
+                           if any(self.__overlaps(failure, other)
+                                  for other in self.__waiters)]
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def __overlaps(failure: tuple, waiter: tuple) -> bool:
+        """ Whether a failed batch holds one of the records of a waiter """
+        return failure[0] <= waiter[1] and waiter[0] <= failure[1]
+
+    def __run(self):
+        """ Flush batches forever
+        """
+        while True:
+            with self.__cond:
+                while not self.__pending:
+                    self.__cond.wait()
+                deadline = time.monotonic() + self.window
+                while len(self.__pending) < self.max_records and \
+                        not self.__urgent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__cond.wait(remaining)
+                batch, self.__pending = self.__pending, []
+                first, seq = self.__flushed + 1, self.__queued
+                self.__urgent = False
+            error = None
+            try:
+                self.__flush(batch)
+            except Exception as e:
+                error = e
+            with self.__cond:
+                failure = (first, seq, error)
+                if error is not None and \
+                        any(self.__overlaps(failure, waiter)
+                            for waiter in self.__waiters):
+                    self.__failures.append(failure)
+                elif error is not None:
+                    # no caller to raise it to: the records are lost
+                    logging.getLogger(__name__).error(
+                        "flush of %d records failed", len(batch),
+                        exc_info=error)
+                self.__flushed = seq
+                self.__cond.notify_all()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+""" Journal file storage module
+"""
+from models.engine.json_storage import JSONStorage
+from typing import Callable, Dict, List, Tuple, TypeVar
+from os import path
+import json
+import os
+import threading
+
+
+JOURNAL_COMPACT_EVERY = int(os.getenv("MODEL_JOURNAL_COMPACT_EVERY", 1000))
+
+
+class JournalStorage(JSONStorage):
+    """ Store the objects of a class as a `.db_{Class}.json` snapshot plus an
+    append-only `.db_{Class}.journal` of the changes made since.
+
+    Each save/remove appends one JSON line to the journal. Once the journal
+    holds `JOURNAL_COMPACT_EVERY` records it is rotated to
+    `.db_{Class}.journal.old` and a new snapshot is written by a background
+    thread, after which the rotated journal is deleted.
+    """
+
+    def __init__(self, fsync: bool = False,
+                 compact_every: int = JOURNAL_COMPACT_EVERY):
+        """ Initialize a JournalStorage instance
+        """
+        super().__init__(fsync)
+        self.compact_every = compact_every
+        self.__lock = threading.Lock()
+        self.__files = {}
+        self.__counts = {}
+        self.__compactions = {}
+
+    def journal_path(self, s_class: str) -> str:
+        """ Path of the journal file of a class
+        """
+        return ".db_{}.journal".format(s_class)
+
+    def load(self, s_class: str) -> Dict[str, dict]:
+        """ Return the snapshot with the journal replayed on top of it
+        """
+        self.wait(s_class)
+        objs_json = super().load(s_class)
+        count = 0
+        journal_path = self.journal_path(s_class)
+        for file_path in (journal_path + ".old", journal_path):
+            if not path.exists(file_path):
+                continue
+            with open(file_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # partial line left by an interrupted write
+                        continue
+                    if record.get('op') == 'save':
+                        objs_json[record['id']] = record['obj']
+                    else:
+                        objs_json.pop(record['id'], None)
+                    count += 1
+        self.__counts[s_class] = count
+        return objs_json
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Append records to the journal in a single write. Return True
+        when the journal is due for compaction
+        """
+        lines = []
+        for op, obj_id, obj_json in records:
+            record = {'op': op, 'id': obj_id}
+            if obj_json is not None:
+                record['obj'] = obj_json
+            lines.append(json.dumps(record) + "\n")
+        with self.__lock:
+            f = self.__files.get(s_class)
+            if f is None:
+                f = open(self.journal_path(s_class), 'a')
+                self.__files[s_class] = f
+            f.write("".join(lines))
+            f.flush()
+            self.sync(f)
+            count = self.__counts.get(s_class, 0) + len(records)
+            self.__counts[s_class] = count
+        return count >= self.compact_every
+
+    def write(self, s_class: str,
+              snapshot: Callable[[], Dict[str, TypeVar('Base')]]):
+        """ Rotate the journal and write a new snapshot in the background,
+        unless a compaction of the class is already running: the journal
+        then keeps growing until the next one
+        """
+        journal_path = self.journal_path(s_class)
+        with self.__lock:
+            running = self.__compactions.get(s_class)
+            if running is not None and running.is_alive():
+                return
+            f = self.__files.pop(s_class, None)
+            if f is not None:
+                f.close()
+            self.__counts[s_class] = 0
+            if path.exists(journal_path):
+                if path.exists(journal_path + ".old"):
+                    # a previous compaction never completed: keep its records
+                    with open(journal_path, 'r') as src, \
+                            open(journal_path + ".old", 'a') as dst:
+                        dst.write(src.read())
+                    os.remove(journal_path)
+                else:
+                    os.replace(journal_path, journal_path + ".old")
+            # taken after the rotation: every change recorded in the
+            # rotated journal is already in the registry
+            objs = snapshot()
+            thread = threading.Thread(target=self.__compact,
+                                      args=(s_class, objs), daemon=True)
+            thread.start()
+            self.__compactions[s_class] = thread
+
+    def wait(self, s_class: str):
+        """ Wait for a running compaction of a class to complete
+        """
+        with self.__lock:
+            thread = self.__compactions.get(s_class)
+        if thread is not None:
+            thread.join()
+
+    def __compact(self, s_class: str, objs: Dict[str, TypeVar('Base')]):
+        """ Write a snapshot and drop the journal it replaces
+        """
+        self.dump(s_class, objs)
+        old_path = self.journal_path(s_class) + ".old"
+        if path.exists(old_path):
+            os.remove(old_path)
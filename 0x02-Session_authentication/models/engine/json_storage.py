@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+""" JSON file storage module
+"""
+from models.engine.storage import Storage
+from typing import Callable, Dict, List, Tuple, TypeVar
+from os import path
+import json
+import os
+import tempfile
+import threading
+
+
+class JSONStorage(Storage):
+    """ Store every object of a class in one `.db_{Class}.json` file,
+    rewritten completely on each change
+
+    The writes of a class are serialized, and each one goes to a temporary
+    file renamed over the previous one, so the file is always complete.
+    """
+
+    def __init__(self, fsync: bool = False):
+        """ Initialize a JSONStorage instance
+        """
+        super().__init__(fsync)
+        self.__locks = {}
+        self.__locks_lock = threading.Lock()
+
+    def class_lock(self, s_class: str) -> threading.Lock:
+        """ Lock serializing the writes of a class
+        """
+        with self.__locks_lock:
+            return self.__locks.setdefault(s_class, threading.Lock())
+
+    def dump(self, s_class: str, objs: Dict[str, TypeVar('Base')]):
+        """ Replace the file of a class by a new one holding the objects
+        """
+        objs_json = {}
+        for obj_id, obj in objs.items():
+            objs_json[obj_id] = obj.to_json(True)
+        self.dump_json(s_class, objs_json)
+
+    def dump_json(self, s_class: str, objs_json: Dict[str, dict]):
+        """ Replace the file of a class by a new one holding the serialized
+        objects
+        """
+        file_path = self.file_path(s_class)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=path.basename(file_path) + ".",
+            suffix=".tmp", dir=path.dirname(file_path) or ".")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(objs_json, f)
+                self.sync(f)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def file_path(self, s_class: str) -> str:
+        """ Path of the JSON file of a class
+        """
+        return ".db_{}.json".format(s_class)
+
+    def load(self, s_class: str) -> Dict[str, dict]:
+        """ Return the serialized objects of a class by ID
+        """
+        file_path = self.file_path(s_class)
+        if not path.exists(file_path):
+            return {}
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
+    def write(self, s_class: str,
+              snapshot: Callable[[], Dict[str, TypeVar('Base')]]):
+        """ Write all objects of a class
+        """
+        with self.class_lock(s_class):
+            self.dump(s_class, snapshot())
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Record a batch of (op, obj_id, obj_json) changes. Return True
+        when the whole class must be written again with `write`
+        """
+        return True
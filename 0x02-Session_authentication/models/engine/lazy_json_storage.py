@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+""" Lazy JSON file storage module
+"""
+from models.engine.json_storage import JSONStorage
+from models.engine.storage import NonResidentStorage
+from typing import List, Tuple
+from os import path
+import json
+import mmap
+import os
+import re
+
+
+WHITESPACE = re.compile(r'\s*')
+
+
+class LazyJSONStorage(NonResidentStorage, JSONStorage):
+    """ Read the `.db_{Class}.json` file of the json engine lazily.
+
+    When a class is registered its file is scanned once to record where
+    each object lies in the file and the values of its indexed attributes;
+    objects are then decoded from a memory map of the file only when they
+    are looked up. Changes are written by copying the raw bytes of the
+    untouched objects, so only the changed ones are serialized again.
+    """
+
+    def _scan(self, s_class: str, js: dict):
+        """ Build the offsets and indexes of a class from its file
+        """
+        self._reset(js)
+        file_path = self.file_path(s_class)
+        if not path.exists(file_path) or path.getsize(file_path) == 0:
+            return
+        mm = self.__map(js, file_path)
+        try:
+            text = mm[:].decode('ascii')
+        except UnicodeDecodeError:
+            # not written by json.dump: re-encode it the way it does
+            with open(file_path, 'r', encoding='utf-8') as f:
+                objs_json = json.load(f)
+            with self.class_lock(s_class):
+                self.dump_json(s_class, objs_json)
+            return self._scan(s_class, js)
+        decoder = json.JSONDecoder()
+        pos = WHITESPACE.match(text, 1).end()
+        while text[pos] != '}':
+            obj_id, pos = decoder.raw_decode(text, pos)
+            pos = WHITESPACE.match(text, pos).end() + 1
+            start = WHITESPACE.match(text, pos).end()
+            obj_json, end = decoder.raw_decode(text, start)
+            self._set(js, obj_id, self._values(js, obj_json), (start, end))
+            pos = WHITESPACE.match(text, end).end()
+            if text[pos] == ',':
+                pos = WHITESPACE.match(text, pos + 1).end()
+
+    def _reset(self, js: dict):
+        """ Drop the offsets and indexes of a class, and its map
+        """
+        super()._reset(js)
+        if js['mm'] is not None:
+            js['mm'].close()
+        js['mm'] = None
+
+    def __map(self, js: dict, file_path: str) -> mmap.mmap:
+        """ Map the file of a class in memory
+        """
+        with open(file_path, 'rb') as f:
+            js['mm'] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return js['mm']
+
+    def _read(self, js: dict, obj_id: str) -> bytes:
+        """ Return the raw JSON of an object
+        """
+        start, end = js['offsets'][obj_id]
+        return js['mm'][start:end]
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Rewrite the file of a class with a batch of changes applied
+        """
+        changes = {}
+        for op, obj_id, obj_json in records:
+            changes[obj_id] = obj_json if op == 'save' else None
+        file_path = self.file_path(s_class)
+        with self._lock:
+            js = self._classes[s_class]
+            obj_ids = list(js['offsets'])
+            obj_ids += [i for i in changes if i not in js['offsets']]
+            chunks = []
+            entries = []
+            pos = 1
+            for obj_id in obj_ids:
+                if obj_id in changes:
+                    if changes[obj_id] is None:
+                        continue
+                    raw = json.dumps(changes[obj_id])
+                    values = self._values(js, changes[obj_id])
+                else:
+                    raw = self._read(js, obj_id).decode('ascii')
+                    values = js['values'][obj_id]
+                key = "{}: ".format(json.dumps(obj_id))
+                start = pos + len(key)
+                chunks.append(key + raw)
+                entries.append((obj_id, values, (start, start + len(raw))))
+                pos = start + len(raw) + 2
+            with open(file_path + ".tmp", 'w') as f:
+                f.write("{" + ", ".join(chunks) + "}")
+                self.sync(f)
+            os.replace(file_path + ".tmp", file_path)
+            self._reset(js)
+            for obj_id, values, offset in entries:
+                self._set(js, obj_id, values, offset)
+            self.__map(js, file_path)
+        return False
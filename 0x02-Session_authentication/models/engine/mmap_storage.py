@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+""" Memory-mapped key-value storage module
+"""
+from models.engine.storage import NonResidentStorage
+from typing import List, Tuple
+import json
+import mmap
+import os
+
+
+MMAP_COMPACT_MIN = int(os.getenv("MODEL_MMAP_COMPACT_MIN", 1 << 20))
+
+
+class MmapStorage(NonResidentStorage):
+    """ Store the objects of a class in an append-only `.db_{Class}.kv`
+    log read through a memory map.
+
+    Each line of the log is `<id>\\t<indexed values>\\t<object>\\n` for a save
+    or `<id>\\t\\n` for a remove. When a class is registered its log is
+    scanned once to build the ID -> offset table and the indexes of the
+    indexed attributes (only the small `<indexed values>` part is parsed);
+    objects are then decoded from the map only when looked up. The log is
+    rewritten without its dead records once they outweigh the live ones.
+    """
+
+    def __init__(self, fsync: bool = False,
+                 compact_min: int = MMAP_COMPACT_MIN):
+        """ Initialize a MmapStorage instance
+        """
+        super().__init__(fsync)
+        self.compact_min = compact_min
+
+    def file_path(self, s_class: str) -> str:
+        """ Path of the log of a class
+        """
+        return ".db_{}.kv".format(s_class)
+
+    def _scan(self, s_class: str, kv: dict):
+        """ Open and scan the log of a class
+        """
+        kv['f'] = open(self.file_path(s_class), 'a+b')
+        kv['size'] = kv['f'].seek(0, os.SEEK_END)
+        kv['mm'] = None
+        if kv['size'] == 0:
+            return
+        mm = self.__map(kv)
+        pos = 0
+        while pos < kv['size']:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                # partial record left by an interrupted write
+                break
+            fields = mm[pos:end].split(b"\t", 2)
+            obj_id = fields[0].decode()
+            if len(fields) == 3:
+                start = pos + len(fields[0]) + len(fields[1]) + 2
+                self._set(kv, obj_id, json.loads(fields[1]), (start, end))
+            else:
+                self._unset(kv, obj_id)
+            pos = end + 1
+
+    def __map(self, kv: dict) -> mmap.mmap:
+        """ Return a map covering the whole log
+        """
+        if kv['mm'] is None or len(kv['mm']) < kv['size']:
+            if kv['mm'] is not None:
+                kv['mm'].close()
+            kv['mm'] = mmap.mmap(kv['f'].fileno(), 0, access=mmap.ACCESS_READ)
+        return kv['mm']
+
+    def _read(self, kv: dict, obj_id: str) -> bytes:
+        """ Return the raw JSON of an object
+        """
+        start, end = kv['offsets'][obj_id]
+        return self.__map(kv)[start:end]
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Append a batch of records to the log in one write
+        """
+        with self._lock:
+            kv = self._classes[s_class]
+            chunks = []
+            changes = []
+            pos = kv['size']
+            for op, obj_id, obj_json in records:
+                head = obj_id.encode() + b"\t"
+                if op == 'save':
+                    values = self._values(kv, obj_json)
+                    head += json.dumps(values).encode() + b"\t"
+                    body = json.dumps(obj_json).encode()
+                    start = pos + len(head)
+                    changes.append((obj_id, values, (start,
+                                                     start + len(body))))
+                else:
+                    body = b""
+                    changes.append((obj_id, None, None))
+                chunk = head + body + b"\n"
+                chunks.append(chunk)
+                pos += len(chunk)
+            kv['f'].write(b"".join(chunks))
+            kv['f'].flush()
+            self.sync(kv['f'])
+            kv['size'] = pos
+            for obj_id, values, offset in changes:
+                if offset is None:
+                    self._unset(kv, obj_id)
+                else:
+                    self._set(kv, obj_id, values, offset)
+            if kv['dead'] > self.compact_min and \
+                    kv['dead'] > kv['size'] - kv['dead']:
+                self.__compact(s_class, kv)
+        return False
+
+    def __compact(self, s_class: str, kv: dict):
+        """ Rewrite the log of a class with its live records only
+        """
+        mm = self.__map(kv)
+        file_path = self.file_path(s_class)
+        with open(file_path + ".tmp", 'wb') as f:
+            for obj_id, (start, end) in kv['offsets'].items():
+                head = obj_id.encode() + b"\t" + \
+                    json.dumps(kv['values'][obj_id]).encode() + b"\t"
+                f.write(head + mm[start:end] + b"\n")
+            self.sync(f)
+        mm.close()
+        kv['f'].close()
+        os.replace(file_path + ".tmp", file_path)
+        self._reset(kv)
+        self._scan(s_class, kv)
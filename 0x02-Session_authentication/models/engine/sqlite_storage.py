@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+""" SQLite storage module
+"""
+from models.engine.storage import Storage
+from typing import Callable, Dict, List, Tuple, TypeVar
+import json
+import os
+import sqlite3
+import threading
+
+
+SQLITE_PATH = os.getenv("MODEL_SQLITE_PATH", ".db_models.sqlite3")
+
+
+class SQLiteStorage(Storage):
+    """ Store the objects of each class in a table of a SQLite database,
+    as their JSON serialization plus one indexed column per indexed
+    attribute of the class. The objects are not loaded in memory: lookups
+    by ID or by indexed attributes are answered by the SQLite indexes.
+    """
+
+    resident = False
+
+    def __init__(self, fsync: bool = False, file_path: str = SQLITE_PATH):
+        """ Initialize a SQLiteStorage instance
+        """
+        super().__init__(fsync)
+        self.__lock = threading.RLock()
+        self.__columns = {}
+        self.__db = sqlite3.connect(file_path, check_same_thread=False,
+                                    isolation_level=None)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous={}".format(
+            "FULL" if fsync else "NORMAL"))
+
+    def register(self, s_class: str, indexed_attributes: tuple):
+        """ Create the table of a class and the indexes of its attributes
+        """
+        with self.__lock:
+            if s_class in self.__columns:
+                return
+            self.__db.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL)'.format(s_class))
+            existing = [row[1] for row in self.__db.execute(
+                'PRAGMA table_info("{}")'.format(s_class))]
+            for attr in indexed_attributes:
+                if attr in existing:
+                    continue
+                self.__db.execute('ALTER TABLE "{0}" ADD COLUMN "{1}"'
+                                  .format(s_class, attr))
+                self.__db.execute(
+                    'UPDATE "{0}" SET "{1}" = json_extract(data, ?)'
+                    .format(s_class, attr), ("$." + attr,))
+                self.__db.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ("{1}")'
+                    .format(s_class, attr))
+            self.__columns[s_class] = tuple(indexed_attributes)
+
+    def load(self, s_class: str) -> Dict[str, dict]:
+        """ Nothing is loaded up front
+        """
+        return {}
+
+    def write(self, s_class: str,
+              snapshot: Callable[[], Dict[str, TypeVar('Base')]]):
+        """ Insert or update the objects given
+        """
+        self.append_many(s_class, [('save', obj_id, obj.to_json(True))
+                                   for obj_id, obj in snapshot().items()])
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Apply a batch of changes in one transaction
+        """
+        columns = self.__columns[s_class]
+        upsert = 'INSERT OR REPLACE INTO "{}" (id, data{}) VALUES (?, ?{})' \
+            .format(s_class, "".join(', "{}"'.format(c) for c in columns),
+                    ", ?" * len(columns))
+        delete = 'DELETE FROM "{}" WHERE id = ?'.format(s_class)
+        with self.__lock:
+            self.__db.execute("BEGIN")
+            try:
+                for op, obj_id, obj_json in records:
+                    if op == 'save':
+                        values = [obj_id, json.dumps(obj_json)]
+                        values += [obj_json.get(c) for c in columns]
+                        self.__db.execute(upsert, values)
+                    else:
+                        self.__db.execute(delete, (obj_id,))
+                self.__db.execute("COMMIT")
+            except BaseException:
+                self.__db.execute("ROLLBACK")
+                raise
+        return False
+
+    def get(self, s_class: str, obj_id: str) -> dict:
+        """ Return one serialized object by ID
+        """
+        with self.__lock:
+            row = self.__db.execute(
+                'SELECT data FROM "{}" WHERE id = ?'.format(s_class),
+                (obj_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, s_class: str, attributes: dict) -> List[dict]:
+        """ Return the serialized objects matching the indexed attributes
+        of the query
+        """
+        conditions = []
+        values = []
+        for k, v in attributes.items():
+            if k == 'id' or k in self.__columns[s_class]:
+                if v is None:
+                    conditions.append('"{}" IS NULL'.format(k))
+                elif isinstance(v, (str, int, float)):
+                    conditions.append('"{}" = ?'.format(k))
+                    values.append(v)
+        query = 'SELECT data FROM "{}"'.format(s_class)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self.__lock:
+            rows = self.__db.execute(query, values).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, s_class: str) -> int:
+        """ Count the objects of a class
+        """
+        with self.__lock:
+            return self.__db.execute(
+                'SELECT COUNT(*) FROM "{}"'.format(s_class)).fetchone()[0]
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+""" Storage engine interface module
+"""
+from typing import Callable, Dict, List, Tuple, TypeVar
+import json
+import os
+import threading
+
+
+class Storage():
+    """ Interface of the storage engines used by models.base.Base
+
+    A resident engine hands every object of a class to `load` and the
+    registry keeps them all in memory. A non-resident engine keeps the
+    objects on disk: `load` returns nothing and the models look objects up
+    with `get`, `find` and `count`, materializing only what they touch.
+    """
+
+    resident = True
+
+    def __init__(self, fsync: bool = False):
+        """ Initialize a storage engine. With `fsync`, writes are forced to
+        disk before returning
+        """
+        self.fsync = fsync
+
+    def sync(self, f):
+        """ Flush an open file to disk if fsync is enabled
+        """
+        if self.fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def register(self, s_class: str, indexed_attributes: tuple):
+        """ Prepare the storage of a class and its indexed attributes
+        """
+        pass
+
+    def load(self, s_class: str) -> Dict[str, dict]:
+        """ Return the serialized objects of a class by ID
+        """
+        raise NotImplementedError
+
+    def write(self, s_class: str,
+              snapshot: Callable[[], Dict[str, TypeVar('Base')]]):
+        """ Write all objects of a class, as returned by `snapshot` once the
+        engine is ready to write them, so that concurrent writes land in
+        the order of their snapshots
+        """
+        raise NotImplementedError
+
+    def append(self, s_class: str, op: str, obj_id: str,
+               obj_json: dict = None) -> bool:
+        """ Record a single change. Return True when the whole class
+        must be written again with `write`
+        """
+        return self.append_many(s_class, [(op, obj_id, obj_json)])
+
+    def append_many(self, s_class: str,
+                    records: List[Tuple[str, str, dict]]) -> bool:
+        """ Record a batch of (op, obj_id, obj_json) changes, op being
+        'save' or 'remove'. Return True when the whole class must be
+        written again with `write`
+        """
+        raise NotImplementedError
+
+    def get(self, s_class: str, obj_id: str) -> dict:
+        """ Return one serialized object by ID (non-resident engines)
+        """
+        raise NotImplementedError
+
+    def find(self, s_class: str, attributes: dict) -> List[dict]:
+        """ Return the serialized objects that may match the attributes,
+        at least all those that do (non-resident engines)
+        """
+        raise NotImplementedError
+
+    def count(self, s_class: str) -> int:
+        """ Count the objects of a class (non-resident engines)
+        """
+        raise NotImplementedError
+
+
+class NonResidentStorage(Storage):
+    """ Base of the engines that keep the objects of a class in a file and
+    only their offsets in memory
+
+    Each registered class has a table holding, for each object ID, the
+    (start, end) offsets of its raw JSON in the file (`offsets`) and the
+    values of its indexed attributes (`values`), plus an index of the IDs
+    by attribute value (`index`) and the size of the records superseded
+    (`dead`). The engine fills the table with `_set`/`_unset` and reads
+    the raw JSON of an object with `_read`; lookups go through the table
+    only.
+    """
+
+    resident = False
+
+    def __init__(self, fsync: bool = False):
+        """ Initialize a NonResidentStorage instance
+        """
+        super().__init__(fsync)
+        self._lock = threading.RLock()
+        self._classes = {}
+
+    def register(self, s_class: str, indexed_attributes: tuple):
+        """ Create the table of a class and fill it with `_scan`
+        """
+        with self._lock:
+            if s_class in self._classes:
+                return
+            table = {'attrs': tuple(indexed_attributes), 'mm': None}
+            self._reset(table)
+            self._classes[s_class] = table
+            self._scan(s_class, table)
+
+    def _scan(self, s_class: str, table: dict):
+        """ Fill the table of a class from its file
+        """
+        raise NotImplementedError
+
+    def _read(self, table: dict, obj_id: str) -> bytes:
+        """ Return the raw JSON of an object
+        """
+        raise NotImplementedError
+
+    def _reset(self, table: dict):
+        """ Drop the offsets and indexes of a table
+        """
+        table['offsets'] = {}
+        table['values'] = {}
+        table['index'] = {attr: {} for attr in table['attrs']}
+        table['dead'] = 0
+
+    def _values(self, table: dict, obj_json: dict) -> dict:
+        """ Return the indexed values of a serialized object
+        """
+        values = {}
+        for attr in table['attrs']:
+            value = obj_json.get(attr)
+            if value is None or isinstance(value, str):
+                values[attr] = value
+        return values
+
+    def _set(self, table: dict, obj_id: str, values: dict, offset: tuple):
+        """ Point an ID to a new record
+        """
+        self._unset(table, obj_id)
+        table['offsets'][obj_id] = offset
+        table['values'][obj_id] = values
+        for attr, value in values.items():
+            if attr in table['index']:
+                table['index'][attr].setdefault(value, {})[obj_id] = None
+
+    def _unset(self, table: dict, obj_id: str):
+        """ Drop the record of an ID
+        """
+        offset = table['offsets'].pop(obj_id, None)
+        if offset is None:
+            return
+        table['dead'] += offset[1] - offset[0]
+        for attr, value in table['values'].pop(obj_id).items():
+            ids = table['index'].get(attr, {}).get(value, {})
+            ids.pop(obj_id, None)
+            if len(ids) == 0 and attr in table['index']:
+                table['index'][attr].pop(value, None)
+
+    def load(self, s_class: str) -> Dict[str, dict]:
+        """ Nothing is loaded up front
+        """
+        return {}
+
+    def write(self, s_class: str,
+              snapshot: Callable[[], Dict[str, TypeVar('Base')]]):
+        """ Save the objects given
+        """
+        self.append_many(s_class, [('save', obj_id, obj.to_json(True))
+                                   for obj_id, obj in snapshot().items()])
+
+    def get(self, s_class: str, obj_id: str) -> dict:
+        """ Return one serialized object by ID
+        """
+        with self._lock:
+            table = self._classes[s_class]
+            if obj_id not in table['offsets']:
+                return None
+            raw = self._read(table, obj_id)
+        return json.loads(raw)
+
+    def find(self, s_class: str, attributes: dict) -> List[dict]:
+        """ Return the serialized objects matching the indexed attributes
+        of the query
+        """
+        with self._lock:
+            table = self._classes[s_class]
+            candidates = None
+            for k, v in attributes.items():
+                if k == 'id':
+                    ids = {v: None} if v in table['offsets'] else {}
+                elif k in table['index'] and \
+                        (v is None or isinstance(v, str)):
+                    ids = table['index'][k].get(v, {})
+                else:
+                    continue
+                if candidates is None:
+                    candidates = list(ids)
+                else:
+                    candidates = [i for i in candidates if i in ids]
+            if candidates is None:
+                candidates = list(table['offsets'])
+            raws = [self._read(table, i) for i in candidates]
+        return [json.loads(raw) for raw in raws]
+
+    def count(self, s_class: str) -> int:
+        """ Count the objects of a class
+        """
+        with self._lock:
+            return len(self._classes[s_class]['offsets'])
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+""" Password hashing module
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Tuple, TypeVar
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import queue
+import threading
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+
+PASSWORD_HASH = os.getenv("PASSWORD_HASH", "pbkdf2_sha256")
+# scheme specific: PBKDF2 iterations, log2 of the scrypt N, bcrypt rounds
+PASSWORD_HASH_COST = os.getenv("PASSWORD_HASH_COST") or None
+# processes hashing and verifying passwords, 0 to do it in the caller
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS",
+                                      os.cpu_count() or 1))
+# rehash passwords stored with another scheme or cost on login
+PASSWORD_REHASH = os.getenv("PASSWORD_REHASH", "1") != "0"
+PASSWORD_REHASH_BATCH = int(os.getenv("PASSWORD_REHASH_BATCH", 100))
+PASSWORD_REHASH_WINDOW = float(os.getenv("PASSWORD_REHASH_WINDOW_MS",
+                                         100)) / 1000
+SALT_SIZE = 16
+
+
+def _b64encode(data: bytes) -> str:
+    """ Unpadded base64 """
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    """ Decode unpadded base64 """
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sha256_hash(pwd: str, cost: int) -> str:
+    """ Unsalted SHA-256 hex digest, the legacy format """
+    return hashlib.sha256(pwd.encode()).hexdigest().lower()
+
+
+def _sha256_verify(pwd: str, hashed: str) -> bool:
+    """ Check a password against a SHA-256 hex digest """
+    return hmac.compare_digest(_sha256_hash(pwd, 0), hashed.lower())
+
+
+def _pbkdf2_hash(pwd: str, cost: int, salt: bytes = None) -> str:
+    """ `$pbkdf2-sha256$<iterations>$<salt>$<hash>` """
+    salt = os.urandom(SALT_SIZE) if salt is None else salt
+    dk = hashlib.pbkdf2_hmac('sha256', pwd.encode(), salt, cost)
+    return "$pbkdf2-sha256${}${}${}".format(cost, _b64encode(salt),
+                                            _b64encode(dk))
+
+
+def _pbkdf2_verify(pwd: str, hashed: str) -> bool:
+    """ Check a password against a PBKDF2 hash """
+    _, _, cost, salt, _ = hashed.split('$')
+    return hmac.compare_digest(
+        _pbkdf2_hash(pwd, int(cost), _b64decode(salt)), hashed)
+
+
+def _scrypt_hash(pwd: str, cost: int, salt: bytes = None) -> str:
+    """ `$scrypt$ln=<log2 N>,r=8,p=1$<salt>$<hash>` """
+    salt = os.urandom(SALT_SIZE) if salt is None else salt
+    n, r, p = 1 << cost, 8, 1
+    dk = hashlib.scrypt(pwd.encode(), salt=salt, n=n, r=r, p=p,
+                        maxmem=256 * r * n, dklen=32)
+    return "$scrypt$ln={},r={},p={}${}${}".format(
+        cost, r, p, _b64encode(salt), _b64encode(dk))
+
+
+def _scrypt_cost(hashed: str) -> int:
+    """ log2 of the N of a scrypt hash """
+    params = hashed.split('$')[2]
+    return int(dict(p.split('=') for p in params.split(','))['ln'])
+
+
+def _scrypt_verify(pwd: str, hashed: str) -> bool:
+    """ Check a password against a scrypt hash """
+    salt = hashed.split('$')[3]
+    return hmac.compare_digest(
+        _scrypt_hash(pwd, _scrypt_cost(hashed), _b64decode(salt)), hashed)
+
+
+def _bcrypt_hash(pwd: str, cost: int) -> str:
+    """ `$2b$<rounds>$<salt and hash>` """
+    return bcrypt.hashpw(pwd.encode(), bcrypt.gensalt(cost)).decode()
+
+
+def _bcrypt_verify(pwd: str, hashed: str) -> bool:
+    """ Check a password against a bcrypt hash """
+    return bcrypt.checkpw(pwd.encode(), hashed.encode())
+
+
+def _tagged_cost(hashed: str) -> int:
+    """ Cost of a `$<tag>$<cost>$...` hash """
+    return int(hashed.split('$')[2])
+
+
+# scheme: (hash, verify, default cost, cost of a hash)
+SCHEMES: Dict[str, Tuple[Callable, Callable, int, Callable]] = {
+    'sha256': (_sha256_hash, _sha256_verify, 0, lambda hashed: 0),
+    'pbkdf2_sha256': (_pbkdf2_hash, _pbkdf2_verify, 600000, _tagged_cost),
+    'scrypt': (_scrypt_hash, _scrypt_verify, 14, _scrypt_cost),
+}
+if bcrypt is not None:
+    SCHEMES['bcrypt'] = (_bcrypt_hash, _bcrypt_verify, 12, _tagged_cost)
+# prefix tag of the hashes of each scheme; untagged hashes are legacy sha256
+TAGS: Dict[str, str] = {
+    '$pbkdf2-sha256$': 'pbkdf2_sha256',
+    '$scrypt$': 'scrypt',
+    '$2a$': 'bcrypt',
+    '$2b$': 'bcrypt',
+    '$2y$': 'bcrypt',
+}
+
+
+def identify(hashed: str) -> str:
+    """ Scheme of a hash, None if unknown or not available
+    """
+    if not hashed.startswith('$'):
+        return 'sha256'
+    for tag, scheme in TAGS.items():
+        if hashed.startswith(tag):
+            return scheme if scheme in SCHEMES else None
+    return None
+
+
+def _hash(scheme: str, cost: int, pwd: str) -> str:
+    """ Hash a password (run in the worker processes) """
+    return SCHEMES[scheme][0](pwd, cost)
+
+
+def _verify(pwd: str, hashed: str) -> bool:
+    """ Verify a password with the scheme of its hash (run in the worker
+    processes) """
+    try:
+        return SCHEMES[identify(hashed)][1](pwd, hashed)
+    except (ValueError, KeyError):
+        return False
+
+
+class PasswordHasher():
+    """ Hash passwords with one of SCHEMES, and verify them with the scheme
+    their hash is tagged with
+
+    The key derivations are slow by design: with `workers` > 0 they run in
+    a pool of that many processes, so a login costs the web worker a wait
+    instead of a core, and at most `workers` hashes run at once.
+    The unsalted SHA-256 scheme is cheap and always runs in the caller.
+    When a worker dies (killed by the OOM killer for instance) the pool is
+    replaced and the work retried in the new one, then in the caller if
+    that one breaks too.
+    """
+
+    def __init__(self, scheme: str = PASSWORD_HASH, cost: int = None,
+                 workers: int = PASSWORD_HASH_WORKERS):
+        """ Initialize a PasswordHasher instance
+        """
+        if scheme not in SCHEMES:
+            raise ValueError("unknown password hash scheme: {}"
+                             .format(scheme))
+        self.scheme = scheme
+        self.cost = int(cost) if cost is not None else SCHEMES[scheme][2]
+        self.workers = workers
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """ The process pool, started on first use """
+        if self.__pool is None:
+            with self.__lock:
+                if self.__pool is None:
+                    self.__pool = ProcessPoolExecutor(self.workers)
+        return self.__pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """ Drop a broken process pool, unless already replaced """
+        with self.__lock:
+            if self.__pool is pool:
+                self.__pool = None
+        pool.shutdown(wait=False)
+
+    def _map(self, fn: Callable, calls: List[tuple]) -> list:
+        """ Call fn with each tuple of arguments in the process pool """
+        for attempt in range(2):
+            pool = self._pool()
+            try:
+                futures = [pool.submit(fn, *args) for args in calls]
+                return [future.result() for future in futures]
+            except BrokenProcessPool:
+                self._discard(pool)
+        return [fn(*args) for args in calls]
+
+    def _run(self, scheme: str, fn: Callable, *args: tuple):
+        """ Call fn in the process pool, or in the caller """
+        if self.workers <= 0 or scheme == 'sha256':
+            return fn(*args)
+        return self._map(fn, [args])[0]
+
+    def hash(self, pwd: str) -> str:
+        """ Hash a password
+        """
+        return self._run(self.scheme, _hash, self.scheme, self.cost, pwd)
+
+    def hash_many(self, pwds: List[str]) -> List[str]:
+        """ Hash passwords, in parallel in the process pool
+        """
+        if self.workers <= 0 or self.scheme == 'sha256':
+            return [self.hash(pwd) for pwd in pwds]
+        return self._map(_hash, [(self.scheme, self.cost, pwd)
+                                 for pwd in pwds])
+
+    def verify(self, pwd: str, hashed: str) -> bool:
+        """ Check a password against its hash
+        """
+        return self._run(identify(hashed), _verify, pwd, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """ Whether a hash is not of the scheme and cost of the hasher
+        """
+        scheme = identify(hashed)
+        if scheme != self.scheme:
+            return True
+        try:
+            return SCHEMES[scheme][3](hashed) != self.cost
+        except (ValueError, KeyError, IndexError):
+            return True
+
+    def shutdown(self):
+        """ Stop the worker processes
+        """
+        with self.__lock:
+            if self.__pool is not None:
+                self.__pool.shutdown()
+                self.__pool = None
+
+
+class RehashQueue():
+    """ Rehash passwords to the scheme and cost of a hasher in the
+    background, after a successful login
+
+    A thread collects the objects submitted for up to `window` seconds or
+    `batch_size` objects, hashes their passwords in parallel and hands the
+    objects whose hash did not change meanwhile to `save_many` at once,
+    which returns those it saved (the objects removed meanwhile are not).
+    The queue is bounded: when it is full the rehash is skipped, and done
+    on a later login. A batch that fails is logged and dropped.
+    """
+
+    def __init__(self, hasher: PasswordHasher,
+                 save_many: Callable[[List[TypeVar('Base')]],
+                                     List[TypeVar('Base')]],
+                 batch_size: int = PASSWORD_REHASH_BATCH,
+                 window: float = PASSWORD_REHASH_WINDOW):
+        """ Initialize a RehashQueue instance
+        """
+        self.hasher = hasher
+        self.save_many = save_many
+        self.batch_size = batch_size
+        self.window = window
+        self.rehashed = 0
+        self.__queue = queue.Queue(batch_size * 10)
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def submit(self, obj: TypeVar('Base'), pwd: str):
+        """ Schedule the rehash of the `_password` of an object
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            with self.__lock:
+                if self.__thread is None or not self.__thread.is_alive():
+                    self.__thread = threading.Thread(target=self.__run,
+                                                     daemon=True)
+                    self.__thread.start()
+        try:
+            self.__queue.put_nowait((obj, pwd, obj._password))
+        except queue.Full:
+            pass
+
+    def __run(self):
+        """ Rehash and save the objects submitted, batch by batch """
+        while True:
+            batch = {}
+            item = self.__queue.get()
+            while item is not None:
+                batch[id(item[0])] = item
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.__queue.get(timeout=self.window)
+                except queue.Empty:
+                    item = None
+            try:
+                self.__rehash(list(batch.values()))
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "rehash of %d passwords failed", len(batch))
+
+    def __rehash(self, items: List[tuple]):
+        """ Rehash and save a batch of (object, password, hash) """
+        hashes = self.hasher.hash_many([pwd for _, pwd, _ in items])
+        objs = []
+        for (obj, _, old_hash), new_hash in zip(items, hashes):
+            if obj._password == old_hash:
+                obj._password = new_hash
+                objs.append(obj)
+        if objs:
+            self.rehashed += len(self.save_many(objs))
+
+
+hasher = PasswordHasher(PASSWORD_HASH, PASSWORD_HASH_COST)
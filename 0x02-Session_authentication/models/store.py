@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+""" Store module
+"""
+from collections import OrderedDict
+from typing import Any, Iterator, List, Tuple
+import os
+import threading
+
+
+STORE_STRIPES = int(os.getenv("MODEL_STORE_STRIPES", 16))
+
+
+class Store():
+    """ Thread-safe registry of the objects of a class by ID
+
+    Writers take the lock of the stripe owning the key, so that changes to
+    the same object (and the bookkeeping done along with them, see `lock`)
+    are serialized while changes to other objects proceed in parallel.
+    Readers never lock: single key reads are atomic and iterations run over
+    a snapshot copied atomically, so they are never disturbed by writers.
+
+    With a `max_size`, the least recently used keys are evicted once the
+    store holds more than `max_size` keys.
+    """
+
+    def __init__(self, stripes: int = STORE_STRIPES, max_size: int = None):
+        """ Initialize a Store instance
+        """
+        self.max_size = max_size
+        self.__data = OrderedDict() if max_size else {}
+        self.__locks = tuple(threading.RLock() for _ in range(stripes))
+
+    def lock(self, key: str) -> threading.RLock:
+        """ Return the lock of the stripe owning a key
+        """
+        return self.__locks[hash(key) % len(self.__locks)]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """ Return the value of a key
+        """
+        value = self.__data.get(key, default)
+        if self.max_size and value is not default:
+            self.__touch(key)
+        return value
+
+    def __touch(self, key: str):
+        """ Mark a key as the most recently used
+        """
+        try:
+            self.__data.move_to_end(key)
+        except KeyError:
+            pass
+
+    def __evict(self):
+        """ Drop the least recently used keys above `max_size`
+        """
+        while len(self.__data) > self.max_size:
+            try:
+                self.__data.popitem(last=False)
+            except KeyError:
+                break
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """ Remove a key and return its value
+        """
+        with self.lock(key):
+            return self.__data.pop(key, default)
+
+    def copy(self) -> dict:
+        """ Return a snapshot of the store as a dict
+        """
+        return self.__data.copy()
+
+    def keys(self) -> List[str]:
+        """ Return a snapshot of the keys
+        """
+        return list(self.copy().keys())
+
+    def values(self) -> List[Any]:
+        """ Return a snapshot of the values
+        """
+        return list(self.copy().values())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """ Return a snapshot of the (key, value) pairs
+        """
+        return list(self.copy().items())
+
+    def __getitem__(self, key: str) -> Any:
+        """ Return the value of a key
+        """
+        value = self.__data[key]
+        if self.max_size:
+            self.__touch(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        """ Set the value of a key
+        """
+        with self.lock(key):
+            self.__data[key] = value
+            if self.max_size:
+                self.__touch(key)
+                self.__evict()
+
+    def __delitem__(self, key: str):
+        """ Remove a key
+        """
+        with self.lock(key):
+            del self.__data[key]
+
+    def __contains__(self, key: str) -> bool:
+        """ Check if a key is present
+        """
+        return key in self.__data
+
+    def __len__(self) -> int:
+        """ Number of keys
+        """
+        return len(self.__data)
+
+    def __iter__(self) -> Iterator[str]:
+        """ Iterate over a snapshot of the keys
+        """
+        return iter(self.keys())
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """ User module
 """
-import hashlib
 from models.base import Base
+from models.password_hasher import hasher, RehashQueue, PASSWORD_REHASH
 from typing import TypeVar
 
 
@@ -10,6 +10,9 @@ class User(Base):
     """ User class
     """
 
+    indexed_attributes: tuple = ('email',)
+    __slots__ = ('email', '_password', 'first_name', 'last_name')
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a User instance
         """
@@ -27,22 +30,26 @@ class User(Base):
 
     @password.setter
     def password(self, pwd: str):
-        """ Setter of a new password: encrypt in SHA256
+        """ Setter of a new password: hash it with PASSWORD_HASH
         """
         if pwd is None or not isinstance(pwd, str):
             self._password = None
         else:
-            self._password = hashlib.sha256(pwd.encode()).hexdigest().lower()
+            self._password = hasher.hash(pwd)
 
     def is_valid_password(self, pwd: str) -> bool:
-        """ Validate a password
+        """ Validate a password, and rehash it in the background when it
+        is stored with an other scheme or cost than PASSWORD_HASH
         """
         if pwd is None or not isinstance(pwd, str):
             return False
         if self.password is None:
             return False
-        pwd_e = pwd.encode()
-        return hashlib.sha256(pwd_e).hexdigest().lower() == self.password
+        if not hasher.verify(pwd, self.password):
+            return False
+        if PASSWORD_REHASH and hasher.needs_rehash(self.password):
+            REHASH_QUEUE.submit(self, pwd)
+        return True
 
     def display_name(self) -> str:
         """ Display User name based on email/first_name/last_name
@@ -58,3 +65,6 @@ class User(Base):
             return "{}".format(self.last_name)
         else:
             return "{} {}".format(self.first_name, self.last_name)
+
+
+REHASH_QUEUE = RehashQueue(hasher, User.save_many)
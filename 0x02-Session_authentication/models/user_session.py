@@ -9,6 +9,9 @@ class UserSession(Base):
     UserSession class
     """
 
+    indexed_attributes: tuple = ('session_id', 'user_id')
+    __slots__ = ('user_id', 'session_id')
+
     def __init__(self, *args: list, **kwargs: dict):
         """
         Initialize a UserSession instance
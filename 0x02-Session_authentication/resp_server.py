@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+""" Local stand-in for a Redis server, for development and tests
+
+Speaks enough of the Redis protocol for SessionRedisAuth: PING, ECHO,
+AUTH, SELECT, GET, SET (EX/PX/NX/XX), DEL, EXISTS, EXPIRE, TTL, DBSIZE,
+FLUSHDB and QUIT. Data lives in memory only.
+
+    $ python3 resp_server.py [port]
+"""
+import socketserver
+import sys
+import threading
+import time
+from api.v1.auth.resp import RESPError
+
+
+class Status(str):
+    """ Simple string reply """
+
+
+OK = Status("OK")
+
+
+class Database():
+    """ Keys with optional expiry """
+
+    def __init__(self):
+        """ Empty database """
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        """ Value of a key, None if missing or expired """
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def run(self, command: list):
+        """ Reply to a command """
+        name, args = command[0].upper(), command[1:]
+        with self.lock:
+            if name == "PING":
+                return args[0] if args else Status("PONG")
+            if name == "ECHO":
+                return args[0]
+            if name in ("AUTH", "SELECT"):
+                return OK
+            if name == "GET":
+                entry = self.get(args[0])
+                return None if entry is None else entry[0]
+            if name == "SET":
+                return self.set(args)
+            if name == "DEL":
+                deleted = 0
+                for key in args:
+                    if self.get(key) is not None:
+                        del self.data[key]
+                        deleted += 1
+                return deleted
+            if name == "EXISTS":
+                return sum(self.get(k) is not None for k in args)
+            if name == "EXPIRE":
+                entry = self.get(args[0])
+                if entry is None:
+                    return 0
+                self.data[args[0]] = (entry[0],
+                                      time.monotonic() + int(args[1]))
+                return 1
+            if name == "TTL":
+                entry = self.get(args[0])
+                if entry is None:
+                    return -2
+                if entry[1] is None:
+                    return -1
+                return int(round(entry[1] - time.monotonic()))
+            if name == "DBSIZE":
+                return len(self.data)
+            if name == "FLUSHDB":
+                self.data.clear()
+                return OK
+        return RESPError("ERR unknown command '{}'".format(command[0]))
+
+    def set(self, args: list):
+        """ SET key value [EX seconds|PX milliseconds] [NX|XX] """
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        expires_at = None
+        if "EX" in options:
+            expires_at = time.monotonic() + \
+                int(args[2 + options.index("EX") + 1])
+        if "PX" in options:
+            expires_at = time.monotonic() + \
+                int(args[2 + options.index("PX") + 1]) / 1000
+        exists = self.get(key) is not None
+        if ("NX" in options and exists) or ("XX" in options and not exists):
+            return None
+        self.data[key] = (value, expires_at)
+        return OK
+
+
+def encode_reply(reply) -> bytes:
+    """ Encode a reply in RESP """
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RESPError):
+        return "-{}\r\n".format(reply).encode("utf-8")
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, Status):
+        return "+{}\r\n".format(reply).encode("utf-8")
+    data = reply.encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    """ Serve the commands of one connection """
+
+    def handle(self):
+        """ Read command arrays until the client leaves """
+        while True:
+            line = self.rfile.readline()
+            if not line.startswith(b"*"):
+                return
+            command = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                command.append(self.rfile.read(length + 2)[:-2]
+                               .decode("utf-8"))
+            if command[0].upper() == "QUIT":
+                self.wfile.write(b"+OK\r\n")
+                return
+            self.wfile.write(encode_reply(self.server.db.run(command)))
+
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    """ Threaded server sharing one database """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple):
+        """ Bind the server """
+        super().__init__(address, RESPHandler)
+        self.db = Database()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 6379
+    with RESPServer(("127.0.0.1", port)) as server:
+        print("Listening on 127.0.0.1:{}".format(port))
+        server.serve_forever()
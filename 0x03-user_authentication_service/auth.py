@@ -8,12 +8,15 @@ from db import DB
 from typing import TypeVar
 from uuid import uuid4, UUID
 from user import User
+import os
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
 
 
 def _hash_password(password: str) -> bytes:
     """Returns a hashed password"""
     if password:
-        salt: bytes = bcrypt.gensalt()
+        salt: bytes = bcrypt.gensalt(BCRYPT_ROUNDS)
         hashed_pw: bytes = bcrypt.hashpw(password.encode("utf-8"), salt)
         return hashed_pw
     return None